@@ -12,15 +12,70 @@ Parses perf report output and identifies hotspots, categorizing them by:
 Generates summary statistics and recommendations.
 """
 
+import operator
 import re
 import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 
-
-@dataclass
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Hotspot lines look like "  12.34%  command  [dso]  symbol_name".
+# Compiled once at import; matched per line as the report is streamed.
+_LINE_RX = re.compile(r'^\s+([\d.]+)%\s+\S+\s+\[([^\]]+)\]\s+(.+)$')
+
+# Sort key for ordering hotspots by percentage, resolved once.
+_pct_key = operator.attrgetter('percentage')
+
+# Report separators, built once instead of per generate_report call.
+_BANNER = "=" * 80
+_HRULE = "-" * 80
+
+# Recommendation rules as (category, threshold, message); rules for the
+# same category are ordered highest threshold first so the first match
+# wins, mirroring the old if/elif chains.
+_RECOMMENDATION_RULES = [
+    ('arrow_conversion', 20,
+     "🔴 Arrow conversion is a CRITICAL bottleneck (>20% CPU)\n"
+     "   ➜ Implement Phase 13.2: SIMD batch operations\n"
+     "   ➜ Use AppendValues() instead of individual Append() calls\n"
+     "   ➜ Pre-allocate builder capacity to avoid resizing\n"),
+    ('arrow_conversion', 10,
+     "🟠 Arrow conversion is a HIGH priority optimization target\n"
+     "   ➜ Consider batch append operations\n"
+     "   ➜ Profile individual builder operations\n"),
+    ('memory_allocation', 15,
+     "🔴 Memory allocation overhead is CRITICAL (>15% CPU)\n"
+     "   ➜ Implement Phase 13.3: Memory pool optimizations\n"
+     "   ➜ Use arena allocator for temporary buffers\n"
+     "   ➜ Pre-allocate Arrow builders with capacity hints\n"),
+    ('memory_allocation', 5,
+     "🟡 Memory allocation has room for optimization\n"
+     "   ➜ Consider object pooling for frequently allocated types\n"),
+    ('parquet_encoding', 20,
+     "🔴 Parquet encoding is a CRITICAL bottleneck (>20% CPU)\n"
+     "   ➜ Implement Phase 13.4: Parallel column writing\n"
+     "   ➜ Enable Arrow's multi-threaded writer if available\n"
+     "   ➜ Consider different compression algorithms (ZSTD vs SNAPPY)\n"),
+    ('string_operations', 10,
+     "🟠 String operations are HIGH priority\n"
+     "   ➜ Use SIMD strlen (SSE4.2) for string builders\n"
+     "   ➜ Batch string append operations where possible\n"),
+    ('io_operations', 15,
+     "🔴 I/O operations are bottleneck (>15% CPU)\n"
+     "   ➜ Async I/O is already implemented - verify it's enabled\n"
+     "   ➜ Consider larger write buffers\n"
+     "   ➜ Profile to ensure I/O is actually async\n"),
+]
+
+
+@dataclass(slots=True, frozen=True)
 class Hotspot:
     """Represents a single hotspot in the profile"""
     percentage: float
@@ -83,30 +138,76 @@ class PerformanceAnalyzer:
         ],
     }
 
+    # Pattern table built once at import time (see below): one entry
+    # per category in declared order, carrying the category's literal
+    # substrings (checked with cheap casefolded `in` tests) and the
+    # fused alternation of its genuinely regex patterns, if any.
+    # Category N's checks — literals and regexes both — run before
+    # category N+1 is consulted, preserving CATEGORIES priority.
+    _CATEGORY_CHECKS: List[Tuple[str, tuple, Optional[re.Pattern]]] = []
+
     def __init__(self, perf_report_path: Path):
         self.perf_report_path = perf_report_path
         self.hotspots: List[Hotspot] = []
+        # SoA columns kept alongside the hotspot records: percentages and
+        # category ids in parse order, so aggregation can run over flat
+        # arrays instead of walking Python objects.
+        self._pct: List[float] = []
+        self._cat_id: List[int] = []
+        # Hotspots grouped by category while parsing, so generate_report
+        # does not rescan the full hotspot list once per category.
+        self._buckets: Dict[str, List[Hotspot]] = defaultdict(list)
 
     def parse_perf_report(self) -> None:
         """Parse perf report and extract hotspots"""
 
-        with open(self.perf_report_path, 'r') as f:
-            content = f.read()
+        # Preallocate the hotspot list from a file-size estimate (~80
+        # bytes per report line) so the scan fills slots in place instead
+        # of growing through repeated list reallocations; the unused tail
+        # is trimmed once at the end.
+        try:
+            estimate = max(256, self.perf_report_path.stat().st_size // 80)
+        except OSError:
+            estimate = 1024
+
+        hotspots = [None] * estimate
+        count = 0
+        match_line = _LINE_RX.match
+        below_threshold_streak = 0
+
+        # Iterate the file handle directly instead of slurping the whole
+        # report: peak memory stays at one buffered line rather than the
+        # full profile (perf reports can run to gigabytes).
+        with open(self.perf_report_path, 'r', buffering=1 << 20) as f:
+            for line in f:
+                # Cheap prefilter: every hotspot line carries a percentage
+                # and a bracketed DSO, so two C-level substring scans
+                # reject headers, blanks and callstack lines before the
+                # regex engine is even invoked.
+                if '%' not in line or '[' not in line:
+                    continue
 
-        # Parse hotspot lines (format: "  12.34%  symbol_name  [dso]")
-        pattern = r'^\s+([\d.]+)%\s+\S+\s+\[([^\]]+)\]\s+(.+)$'
+                match = match_line(line)
+                if not match:
+                    continue
 
-        for line in content.split('\n'):
-            match = re.match(pattern, line)
-            if match:
                 percentage = float(match.group(1))
-                dso = match.group(2)
-                symbol = match.group(3).strip()
 
-                # Skip very small hotspots (<0.5%)
+                # Skip very small hotspots (<0.5%). perf sorts its report
+                # by descending overhead, so once a run of lines falls
+                # below the threshold the long tail of tiny samples is
+                # all that remains — stop scanning instead of regex-matching
+                # every one of them. The streak guard keeps this robust to
+                # the occasional interleaved section header.
                 if percentage < 0.5:
+                    below_threshold_streak += 1
+                    if below_threshold_streak >= 20:
+                        break
                     continue
+                below_threshold_streak = 0
 
+                dso = match.group(2)
+                symbol = match.group(3).strip()
                 category = self._categorize_symbol(symbol, dso)
 
                 hotspot = Hotspot(
@@ -115,8 +216,16 @@ class PerformanceAnalyzer:
                     dso=dso,
                     category=category
                 )
+                if count == len(hotspots):  # estimate was too low
+                    hotspots.extend([None] * len(hotspots))
+                hotspots[count] = hotspot
+                count += 1
+                self._buckets[category].append(hotspot)
+                self._pct.append(percentage)
+                self._cat_id.append(_CAT_TO_ID[category])
 
-                self.hotspots.append(hotspot)
+        del hotspots[count:]
+        self.hotspots = hotspots
 
     def _categorize_symbol(self, symbol: str, dso: str) -> str:
         """Categorize a symbol based on patterns"""
@@ -124,11 +233,21 @@ class PerformanceAnalyzer:
         # Check DSO first for library-specific categorization
         combined = f"{dso} {symbol}"
 
-        for category, patterns in self.CATEGORIES.items():
-            for pattern in patterns:
-                if re.search(pattern, combined, re.IGNORECASE):
+        # One pass per category in declared order. Within a category
+        # the literal substrings go first — C-level scans, far cheaper
+        # than the regex engine, and they cover the bulk of real symbols
+        # (malloc, memcpy, snappy::, ...) — then its fused alternation.
+        # Literals must not run globally ahead of every regex: that
+        # would let a later category's literal (io_operations' "write")
+        # claim symbols an earlier category's regex owns
+        # (parquet::.*Writer).
+        lowered = combined.casefold()
+        for category, literals, rx in self._CATEGORY_CHECKS:
+            for literal in literals:
+                if literal in lowered:
                     return category
-
+            if rx is not None and rx.search(combined):
+                return category
         return 'other'
 
     def generate_report(self) -> str:
@@ -137,10 +256,23 @@ class PerformanceAnalyzer:
         if not self.hotspots:
             return "No hotspots found. Did you parse the perf report?"
 
-        # Aggregate by category
-        category_totals: Dict[str, float] = defaultdict(float)
-        for hotspot in self.hotspots:
-            category_totals[hotspot.category] += hotspot.percentage
+        # Aggregate by category: one vectorized bincount over the SoA
+        # columns when numpy is around, plain Python sweep otherwise.
+        if HAS_NUMPY:
+            totals = np.bincount(
+                np.asarray(self._cat_id, dtype=np.int64),
+                weights=np.asarray(self._pct, dtype=np.float64),
+                minlength=len(_CATEGORY_NAMES)
+            )
+            category_totals: Dict[str, float] = {
+                name: float(total)
+                for name, total in zip(_CATEGORY_NAMES, totals)
+                if total > 0
+            }
+        else:
+            category_totals = defaultdict(float)
+            for hotspot in self.hotspots:
+                category_totals[hotspot.category] += hotspot.percentage
 
         # Sort categories by total percentage
         sorted_categories = sorted(
@@ -149,55 +281,57 @@ class PerformanceAnalyzer:
             reverse=True
         )
 
-        # Build report
+        # Build report; bind append once so the hot loops below skip the
+        # repeated attribute lookup.
         report = []
-        report.append("=" * 80)
-        report.append("Performance Analysis Report")
-        report.append("=" * 80)
-        report.append("")
+        out = report.append
+        out(_BANNER)
+        out("Performance Analysis Report")
+        out(_BANNER)
+        out("")
 
         # Category summary
-        report.append("## CPU Time by Category")
-        report.append("")
-        report.append(f"{'Category':<30} {'CPU Time':>12} {'Impact':>10}")
-        report.append("-" * 80)
+        out("## CPU Time by Category")
+        out("")
+        out(f"{'Category':<30} {'CPU Time':>12} {'Impact':>10}")
+        out(_HRULE)
 
         total_cpu = sum(category_totals.values())
 
         for category, percentage in sorted_categories:
             impact = self._impact_level(percentage)
-            report.append(f"{category:<30} {percentage:>11.2f}% {impact:>10}")
+            out("%-30s %11.2f%% %10s" % (category, percentage, impact))
 
-        report.append("-" * 80)
-        report.append(f"{'Total Accounted':<30} {total_cpu:>11.2f}%")
-        report.append("")
+        out(_HRULE)
+        out("%-30s %11.2f%%" % ("Total Accounted", total_cpu))
+        out("")
 
         # Top hotspots per category
-        report.append("## Top Hotspots by Category")
-        report.append("")
+        out("## Top Hotspots by Category")
+        out("")
 
         for category, _ in sorted_categories:
-            category_hotspots = [h for h in self.hotspots if h.category == category]
+            category_hotspots = self._buckets.get(category)
             if not category_hotspots:
                 continue
 
             # Sort by percentage within category
-            category_hotspots.sort(key=lambda h: h.percentage, reverse=True)
+            category_hotspots = sorted(category_hotspots, key=_pct_key, reverse=True)
 
-            report.append(f"### {category.upper().replace('_', ' ')}")
-            report.append("")
+            out(f"### {category.upper().replace('_', ' ')}")
+            out("")
 
             for hotspot in category_hotspots[:5]:  # Top 5
-                report.append(f"  {hotspot.percentage:>6.2f}%  {hotspot.symbol[:70]}")
+                out("  %6.2f%%  %s" % (hotspot.percentage, hotspot.symbol[:70]))
 
-            report.append("")
+            out("")
 
         # Optimization recommendations
-        report.append("## Optimization Recommendations")
-        report.append("")
-        report.append(self._generate_recommendations(category_totals))
+        out("## Optimization Recommendations")
+        out("")
+        out(self._generate_recommendations(category_totals))
 
-        report.append("=" * 80)
+        out(_BANNER)
 
         return "\n".join(report)
 
@@ -216,61 +350,17 @@ class PerformanceAnalyzer:
         """Generate optimization recommendations based on hotspots"""
 
         recommendations = []
+        matched = set()
 
-        # Arrow conversion recommendations
-        if category_totals.get('arrow_conversion', 0) >= 20:
-            recommendations.append(
-                "🔴 Arrow conversion is a CRITICAL bottleneck (>20% CPU)\n"
-                "   ➜ Implement Phase 13.2: SIMD batch operations\n"
-                "   ➜ Use AppendValues() instead of individual Append() calls\n"
-                "   ➜ Pre-allocate builder capacity to avoid resizing\n"
-            )
-        elif category_totals.get('arrow_conversion', 0) >= 10:
-            recommendations.append(
-                "🟠 Arrow conversion is a HIGH priority optimization target\n"
-                "   ➜ Consider batch append operations\n"
-                "   ➜ Profile individual builder operations\n"
-            )
-
-        # Memory allocation recommendations
-        if category_totals.get('memory_allocation', 0) >= 15:
-            recommendations.append(
-                "🔴 Memory allocation overhead is CRITICAL (>15% CPU)\n"
-                "   ➜ Implement Phase 13.3: Memory pool optimizations\n"
-                "   ➜ Use arena allocator for temporary buffers\n"
-                "   ➜ Pre-allocate Arrow builders with capacity hints\n"
-            )
-        elif category_totals.get('memory_allocation', 0) >= 5:
-            recommendations.append(
-                "🟡 Memory allocation has room for optimization\n"
-                "   ➜ Consider object pooling for frequently allocated types\n"
-            )
-
-        # Parquet encoding recommendations
-        if category_totals.get('parquet_encoding', 0) >= 20:
-            recommendations.append(
-                "🔴 Parquet encoding is a CRITICAL bottleneck (>20% CPU)\n"
-                "   ➜ Implement Phase 13.4: Parallel column writing\n"
-                "   ➜ Enable Arrow's multi-threaded writer if available\n"
-                "   ➜ Consider different compression algorithms (ZSTD vs SNAPPY)\n"
-            )
-
-        # String operations recommendations
-        if category_totals.get('string_operations', 0) >= 10:
-            recommendations.append(
-                "🟠 String operations are HIGH priority\n"
-                "   ➜ Use SIMD strlen (SSE4.2) for string builders\n"
-                "   ➜ Batch string append operations where possible\n"
-            )
-
-        # I/O recommendations
-        if category_totals.get('io_operations', 0) >= 15:
-            recommendations.append(
-                "🔴 I/O operations are bottleneck (>15% CPU)\n"
-                "   ➜ Async I/O is already implemented - verify it's enabled\n"
-                "   ➜ Consider larger write buffers\n"
-                "   ➜ Profile to ensure I/O is actually async\n"
-            )
+        # Single pass over the declarative rule table; rules for the same
+        # category are ordered highest threshold first, and only the first
+        # matching rule per category fires.
+        for category, threshold, message in _RECOMMENDATION_RULES:
+            if category in matched:
+                continue
+            if category_totals.get(category, 0) >= threshold:
+                matched.add(category)
+                recommendations.append(message)
 
         if not recommendations:
             recommendations.append(
@@ -283,6 +373,29 @@ class PerformanceAnalyzer:
         return "\n".join(recommendations)
 
 
+# Stable category -> id mapping for the SoA columns ('other' sorts last).
+_CATEGORY_NAMES = list(PerformanceAnalyzer.CATEGORIES) + ['other']
+_CAT_TO_ID = {name: i for i, name in enumerate(_CATEGORY_NAMES)}
+
+# Split each category's patterns into plain substrings (checked with
+# casefolded `in` tests) and genuine regexes. Patterns within one
+# category share a priority, so its regexes fuse into a single
+# alternation; categories stay separate entries in declared order,
+# because priority across categories cannot be expressed in one
+# combined regex (re.search returns the leftmost match in the string,
+# not the first alternative). A pattern is a literal exactly when
+# re.escape leaves it unchanged.
+for _category, _patterns in PerformanceAnalyzer.CATEGORIES.items():
+    _literals = tuple(p.casefold() for p in _patterns if re.escape(p) == p)
+    _regexes = [p for p in _patterns if re.escape(p) != p]
+    PerformanceAnalyzer._CATEGORY_CHECKS.append((
+        _category,
+        _literals,
+        re.compile('|'.join(f'(?:{p})' for p in _regexes), re.IGNORECASE)
+        if _regexes else None,
+    ))
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: analyze_performance.py <perf_report.txt>")
@@ -16,14 +16,65 @@ Measures:
 Calculates speedup ratios and identifies format tradeoffs.
 """
 
+import concurrent.futures
 import subprocess
 import json
+import threading
 import time
 import re
 import os
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from statistics import mean, stdev
+
+
+def _mean(values):
+    """Plain float average; statistics.mean is ~20x slower on floats
+    because it routes through exact Fraction arithmetic."""
+    return sum(values) / len(values) if values else 0.0
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def compute_parallelism():
+    """Pick how many benchmark subprocesses to run at once.
+
+    Honors the PARALLEL_BENCH env override, otherwise scales 1/2/4/8
+    workers with available RAM (each child can use several GB at large
+    scale factors). Falls back to a conservative CPU-based guess when
+    psutil is not installed.
+    """
+    override = os.environ.get("PARALLEL_BENCH")
+    if override:
+        return max(1, int(override))
+
+    if HAS_PSUTIL:
+        available_gb = psutil.virtual_memory().available / (1 << 30)
+        if available_gb >= 32:
+            return 8
+        if available_gb >= 16:
+            return 4
+        if available_gb >= 8:
+            return 2
+        return 1
+
+    return min(4, os.cpu_count() or 1)
+
+# Metric-extraction patterns, compiled once instead of per benchmark run.
+_TP_RX = re.compile(r'Throughput:\s*(\d+(?:\.\d+)?)\s*rows/sec')
+_WR_RX = re.compile(r'Write rate:\s*(\d+(?:\.\d+)?)\s*MB/sec')
+_ET_RX = re.compile(r'Time elapsed:\s*(\d+(?:\.\d+)?)\s*seconds')
+_ROWS_RX = re.compile(r'Rows written:\s*(\d+)')
 
 # All 8 TPC-H tables with row counts per scale factor
 # Format: (table_name, rows_sf1, rows_sf10, rows_sf100)
@@ -38,6 +89,13 @@ TABLES = [
     ("region", 5, 5, 5),                    # 1/3 numeric (33%)
 ]
 
+# O(1) (table, scale_factor) -> row count lookup derived from TABLES.
+ROW_COUNTS = {
+    (table_name, sf): count
+    for table_name, *counts in TABLES
+    for sf, count in zip((1, 10, 100), counts)
+}
+
 class OrcVsParquetBenchmark:
     def __init__(self, tpch_binary, output_dir="/tmp/orc_vs_parquet_benchmark", scale_factors=None, formats=None):
         self.tpch_binary = Path(tpch_binary)
@@ -47,6 +105,10 @@ class OrcVsParquetBenchmark:
         self.formats = formats or ["orc", "parquet"]
         self.results = {}
         self.benchmark_date = datetime.now().isoformat()
+        # Copied once; {**os.environ, ...} per launch would re-copy the
+        # full process environment for every benchmark subprocess.
+        self._child_env = os.environ.copy()
+        self._child_env["OMP_NUM_THREADS"] = os.environ.get("OMP_NUM_THREADS", "8")
 
         # Initialize results structure
         for sf in self.scale_factors:
@@ -64,22 +126,22 @@ class OrcVsParquetBenchmark:
         }
 
         # Parse throughput (rows/sec)
-        match = re.search(r'Throughput:\s*(\d+(?:\.\d+)?)\s*rows/sec', output_text)
+        match = _TP_RX.search(output_text)
         if match:
             metrics["throughput"] = float(match.group(1))
 
         # Parse write rate (MB/sec)
-        match = re.search(r'Write rate:\s*(\d+(?:\.\d+)?)\s*MB/sec', output_text)
+        match = _WR_RX.search(output_text)
         if match:
             metrics["write_rate"] = float(match.group(1))
 
         # Parse elapsed time (seconds)
-        match = re.search(r'Time elapsed:\s*(\d+(?:\.\d+)?)\s*seconds', output_text)
+        match = _ET_RX.search(output_text)
         if match:
             metrics["elapsed_time"] = float(match.group(1))
 
         # Parse rows written
-        match = re.search(r'Rows written:\s*(\d+)', output_text)
+        match = _ROWS_RX.search(output_text)
         if match:
             metrics["rows_written"] = int(match.group(1))
 
@@ -103,20 +165,41 @@ class OrcVsParquetBenchmark:
 
         try:
             start = time.time()
-            result = subprocess.run(
+            # Stream child output instead of buffering it all: only a
+            # bounded tail of recent lines is retained (the metrics sit in
+            # the last few lines), so verbose runs no longer spike the
+            # driver's memory, and only that tail is ever decoded.
+            stdout_tail = deque(maxlen=256)
+            stderr_tail = deque(maxlen=64)
+
+            with subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10 minute timeout for large scale factors
-                env={**os.environ, "OMP_NUM_THREADS": "8"}
-            )
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=1 << 16,
+                env=self._child_env
+            ) as proc:
+                readers = [
+                    threading.Thread(target=lambda s=stream, t=tail: t.extend(s), daemon=True)
+                    for stream, tail in ((proc.stdout, stdout_tail), (proc.stderr, stderr_tail))
+                ]
+                for t in readers:
+                    t.start()
+                try:
+                    returncode = proc.wait(timeout=600)  # 10 minute timeout for large scale factors
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    raise
+                for t in readers:
+                    t.join()
+
             elapsed = time.time() - start
 
-            if result.returncode != 0:
-                print(f"    FAILED: {result.stderr[:100]}")
+            if returncode != 0:
+                print(f"    FAILED: {b''.join(stderr_tail)[:200].decode('utf-8', 'replace')[:100]}")
                 return None
 
-            metrics = self._parse_metrics(result.stdout)
+            metrics = self._parse_metrics(b''.join(stdout_tail)[-8192:].decode('utf-8', 'replace'))
 
             # Verify output file was created and get file size
             file_path = output_path / f"{table_name}.{format_type}"
@@ -150,15 +233,7 @@ class OrcVsParquetBenchmark:
 
     def _get_row_count(self, table_name, scale_factor):
         """Get row count for a table at given scale factor"""
-        for tname, sf1, sf10, sf100 in TABLES:
-            if tname == table_name:
-                if scale_factor == 1:
-                    return sf1
-                elif scale_factor == 10:
-                    return sf10
-                elif scale_factor == 100:
-                    return sf100
-        return 0
+        return ROW_COUNTS.get((table_name, scale_factor), 0)
 
     def run_full_benchmark(self):
         """Run benchmark for all tables, formats, and scale factors"""
@@ -172,6 +247,42 @@ class OrcVsParquetBenchmark:
         print(f"Date: {self.benchmark_date}")
         print("="*120)
 
+        # Build the full (scale_factor, format, table) job matrix up front
+        # and run it on a thread pool: the workers just wait on child
+        # processes, so threads are enough to keep several benchmark
+        # binaries busy at once.
+        jobs = []
+        for scale_factor in self.scale_factors:
+            for format_type in self.formats:
+                for table_name, _, _, _ in TABLES:
+                    row_count = self._get_row_count(table_name, scale_factor)
+                    if row_count == 0:
+                        continue
+                    jobs.append((scale_factor, format_type, table_name, row_count))
+
+        max_workers = compute_parallelism()
+        print(f"Parallelism: {max_workers} concurrent benchmark(s)")
+
+        completed = {}
+        results_lock = threading.Lock()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self.run_benchmark, table_name, row_count, format_type, scale_factor):
+                    (scale_factor, format_type, table_name)
+                for scale_factor, format_type, table_name, row_count in jobs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                key = futures[future]
+                result = future.result()
+                with results_lock:
+                    completed[key] = result
+                    if result:
+                        scale_factor, format_type, table_name = key
+                        self.results[f"sf{scale_factor}"][format_type][table_name] = result
+
+        # Print the per-format tables in declared order now that all runs
+        # have finished, so output stays deterministic under parallelism.
         for scale_factor in self.scale_factors:
             print(f"\n{'='*120}")
             print(f"Scale Factor: {scale_factor}")
@@ -189,9 +300,7 @@ class OrcVsParquetBenchmark:
                     if row_count == 0:
                         continue
 
-                    print(f"{table_name:<15} {row_count:<12} ", end="", flush=True)
-
-                    result = self.run_benchmark(table_name, row_count, format_type, scale_factor)
+                    result = completed.get((scale_factor, format_type, table_name))
 
                     if result:
                         throughput = result["throughput"]
@@ -199,17 +308,22 @@ class OrcVsParquetBenchmark:
                         elapsed = result["elapsed_time"]
                         file_size = result["file_size"]
 
-                        print(f"{throughput:>15,.0f} {write_rate:>12.2f} MB/s {elapsed:>9.3f}s {file_size/1024/1024:>11.2f}M")
-
-                        sf_key = f"sf{scale_factor}"
-                        self.results[sf_key][format_type][table_name] = result
+                        print(f"{table_name:<15} {row_count:<12} {throughput:>15,.0f} {write_rate:>12.2f} MB/s {elapsed:>9.3f}s {file_size/1024/1024:>11.2f}M")
                         format_results.append(result)
                     else:
-                        print("FAILED")
+                        print(f"{table_name:<15} {row_count:<12} FAILED")
 
                 if format_results:
-                    avg_throughput = mean([r["throughput"] for r in format_results if r["throughput"] > 0])
-                    avg_write_rate = mean([r["write_rate"] for r in format_results if r["write_rate"] > 0])
+                    tp_sum = tp_n = wr_sum = wr_n = 0
+                    for r in format_results:
+                        if r["throughput"] > 0:
+                            tp_sum += r["throughput"]
+                            tp_n += 1
+                        if r["write_rate"] > 0:
+                            wr_sum += r["write_rate"]
+                            wr_n += 1
+                    avg_throughput = tp_sum / tp_n if tp_n else 0.0
+                    avg_write_rate = wr_sum / wr_n if wr_n else 0.0
                     print(f"\n{'-'*120}")
                     print(f"{'Average':<15} {avg_throughput:>15,.0f} {avg_write_rate:>12.2f} MB/s")
                 print()
@@ -264,7 +378,7 @@ class OrcVsParquetBenchmark:
                     print(f"{table_name:<15} (missing data)")
 
             if speedups:
-                avg_speedup = mean([s[1] for s in speedups])
+                avg_speedup = _mean([s[1] for s in speedups])
                 print("-" * 120)
                 sign = "+" if avg_speedup > 1 else ""
                 print(f"{'Average':>15} {sign}{(avg_speedup-1)*100:>23.1f}% ({fmt2.upper()} is {avg_speedup:.2f}x)")
@@ -313,8 +427,14 @@ class OrcVsParquetBenchmark:
             "results": self.results
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        # orjson serializes in C (dates are already isoformat strings, so
+        # no native-type issues); stdlib json is the fallback.
+        if HAS_ORJSON:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(summary, f, indent=2)
 
         print(f"\n\nDetailed results saved to: {output_file}")
 
@@ -14,17 +14,30 @@ Arguments:
   output_file      Output JSON file (default: stdout)
 """
 
+import concurrent.futures
 import json
+import mmap
 import sys
 import os
 import re
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
 
+try:
+    import orjson
 
-@dataclass
+    def _dumps(obj) -> bytes:
+        """Serialize through orjson's C encoder when it is installed."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+
+@dataclass(slots=True)
 class BenchmarkResult:
     """Represents a single benchmark result"""
     test_name: str
@@ -40,26 +53,134 @@ class BenchmarkResult:
     success: bool = True
     error_message: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict of all fields.
+
+        dataclasses.asdict recurses with deep-copy semantics, which is
+        needless for a flat record of primitives and slow when
+        serializing thousands of results.
+        """
+        return {name: getattr(self, name) for name in _RESULT_FIELDS}
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(BenchmarkResult))
+
+
+# All metric and critical-error patterns fused into one alternation:
+# parse_log_file scans each log exactly once with finditer and
+# dispatches on the matched group name, instead of nine separate
+# full-content searches. The pattern is bytes-mode so it can run
+# directly over an mmap of the log with no decode pass; everything
+# it matches is ASCII. Metric values are captured by the *_v
+# subgroups; error alternatives keep their case-insensitive matching
+# via inline (?i:...) flags.
+_COMBINED = re.compile(
+    rb'(?P<rows_written>Rows written:\s+(?P<rows_written_v>\d+))'
+    rb'|(?P<throughput>Throughput:\s+(?P<throughput_v>\d+)\s+rows/sec)'
+    rb'|(?P<write_rate>Write rate:\s+(?P<write_rate_v>[\d.]+)\s+MB/sec)'
+    rb'|(?P<file_size>File size:\s+(?P<file_size_v>\d+)\s+bytes)'
+    rb'|(?P<elapsed_time>Elapsed time:\s+(?P<elapsed_time_v>\d+(?:\.\d+)?)\s+(?:sec|seconds))'
+    rb'|(?i:(?P<crash>Segmentation fault|SIGSEGV))'
+    rb'|(?i:(?P<oom>out of memory|ENOMEM|bad_alloc))'
+    rb'|(?i:(?P<timeout>timeout|timed out))'
+    rb'|(?i:(?P<fatal>FATAL|Fatal error))'
+)
+
+# Matched group name -> (BenchmarkResult attribute, converter).
+_METRIC_SETTERS = {
+    'rows_written': ('rows_written', int),
+    'throughput': ('throughput_rows_per_sec', int),
+    'write_rate': ('write_rate_mb_per_sec', float),
+    'file_size': ('file_size_bytes', int),
+    'elapsed_time': ('elapsed_time_ms', lambda v: int(float(v) * 1000)),
+}
+
+# Group names that indicate benchmark failure
+_ERROR_GROUPS = frozenset(('crash', 'oom', 'timeout', 'fatal'))
+
+
+def parse_log_file(log_file: Path) -> Optional[BenchmarkResult]:
+    """Parse a single benchmark log file.
+
+    Module-level (and picklable) so parse_all_logs can fan files out to
+    a process pool.
+    """
+    try:
+        # Extract test name from filename
+        # Format: {format}_{table}_{mode}.log
+        stem = log_file.stem
+        parts = stem.split('_')
+
+        if len(parts) < 3:
+            print(f"Warning: Could not parse filename: {log_file.name}", file=sys.stderr)
+            return None
 
-class BenchmarkLogParser:
-    """Parser for TPC-H benchmark output logs"""
+        # Handle table names that may contain underscores
+        # Assume format is always first, mode is always last
+        # The grouping keys are interned: the same handful of
+        # format/table/mode names recurs across every log, and interned
+        # strings hash and compare by pointer in the aggregation dicts.
+        format_name = sys.intern(parts[0])
+        mode_name = sys.intern(parts[-1])
+        table_name = sys.intern('_'.join(parts[1:-1]))
+
+        result = BenchmarkResult(
+            test_name=stem,
+            format=format_name,
+            table=table_name,
+            mode=mode_name,
+            scale_factor=1,  # Default to SF=1 for CI
+        )
+
+        # Memory-map the log and extract metrics / spot critical
+        # errors in one pass directly over the mapped bytes — no
+        # decoded copy of the file is ever made. The first occurrence
+        # wins for each metric, matching the old per-pattern search
+        # behavior. int()/float() convert the captured bytes directly.
+        error_type = None
+        seen = set()
+        with open(log_file, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for match in _COMBINED.finditer(mm):
+                        group = match.lastgroup
+                        if group in _ERROR_GROUPS:
+                            if error_type is None:
+                                error_type = group
+                        elif group not in seen:
+                            seen.add(group)
+                            attr, convert = _METRIC_SETTERS[group]
+                            setattr(result, attr, convert(match.group(group + '_v')))
+
+        if error_type is not None:
+            result.success = False
+            result.error_message = f"Benchmark {error_type} detected"
+            return result
 
-    # Regex patterns for extracting metrics
-    PATTERNS = {
-        'rows_written': r'Rows written:\s+(\d+)',
-        'throughput': r'Throughput:\s+(\d+)\s+rows/sec',
-        'write_rate': r'Write rate:\s+([\d.]+)\s+MB/sec',
-        'file_size': r'File size:\s+(\d+)\s+bytes',
-        'elapsed_time': r'Elapsed time:\s+(\d+(?:\.\d+)?)\s+(?:sec|seconds)',
-    }
+        # Check for empty output (indicates timeout or crash)
+        if file_size < 50:
+            result.success = False
+            result.error_message = "Incomplete output (possible timeout or crash)"
+            return result
 
-    # Critical error patterns that indicate benchmark failure
-    CRITICAL_ERRORS = {
-        'crash': r'Segmentation fault|SIGSEGV',
-        'oom': r'out of memory|ENOMEM|bad_alloc',
-        'timeout': r'timeout|timed out',
-        'fatal': r'FATAL|Fatal error',
-    }
+        # Success if we extracted at least some metrics
+        if result.throughput_rows_per_sec is not None or result.rows_written is not None:
+            result.success = True
+        else:
+            # If no metrics were extracted and no critical errors, still mark as incomplete
+            result.success = False
+            result.error_message = "Could not extract benchmark metrics"
+
+        return result
+
+    except Exception as e:
+        print(f"Error parsing {log_file.name}: {e}", file=sys.stderr)
+        return None
+
+
+class BenchmarkLogParser:
+    """Parser for TPC-H benchmark output logs"""
 
     def __init__(self, log_directory: str):
         self.log_directory = Path(log_directory)
@@ -67,89 +188,33 @@ class BenchmarkLogParser:
 
     def parse_log_file(self, log_file: Path) -> Optional[BenchmarkResult]:
         """Parse a single benchmark log file"""
-        try:
-            with open(log_file, 'r') as f:
-                content = f.read()
-
-            # Extract test name from filename
-            # Format: {format}_{table}_{mode}.log
-            stem = log_file.stem
-            parts = stem.split('_')
-
-            if len(parts) < 3:
-                print(f"Warning: Could not parse filename: {log_file.name}", file=sys.stderr)
-                return None
-
-            # Handle table names that may contain underscores
-            # Assume format is always first, mode is always last
-            format_name = parts[0]
-            mode_name = parts[-1]
-            table_name = '_'.join(parts[1:-1])
-
-            result = BenchmarkResult(
-                test_name=stem,
-                format=format_name,
-                table=table_name,
-                mode=mode_name,
-                scale_factor=1,  # Default to SF=1 for CI
-            )
-
-            # Extract metrics using regex patterns
-            for metric, pattern in self.PATTERNS.items():
-                match = re.search(pattern, content)
-                if match:
-                    value = match.group(1)
-                    if metric == 'rows_written':
-                        result.rows_written = int(value)
-                    elif metric == 'throughput':
-                        result.throughput_rows_per_sec = int(value)
-                    elif metric == 'write_rate':
-                        result.write_rate_mb_per_sec = float(value)
-                    elif metric == 'file_size':
-                        result.file_size_bytes = int(value)
-                    elif metric == 'elapsed_time':
-                        # Convert seconds to milliseconds
-                        result.elapsed_time_ms = int(float(value) * 1000)
-
-            # Check for critical errors only
-            for error_type, pattern in self.CRITICAL_ERRORS.items():
-                if re.search(pattern, content, re.IGNORECASE):
-                    result.success = False
-                    result.error_message = f"Benchmark {error_type} detected"
-                    return result
-
-            # Check for empty output (indicates timeout or crash)
-            if len(content) < 50:
-                result.success = False
-                result.error_message = "Incomplete output (possible timeout or crash)"
-                return result
-
-            # Success if we extracted at least some metrics
-            if result.throughput_rows_per_sec is not None or result.rows_written is not None:
-                result.success = True
-            else:
-                # If no metrics were extracted and no critical errors, still mark as incomplete
-                result.success = False
-                result.error_message = "Could not extract benchmark metrics"
-
-            return result
-
-        except Exception as e:
-            print(f"Error parsing {log_file.name}: {e}", file=sys.stderr)
-            return None
+        return parse_log_file(log_file)
 
     def parse_all_logs(self) -> List[BenchmarkResult]:
         """Parse all log files in the directory"""
-        log_files = sorted(self.log_directory.glob('*.log'))
+        # os.scandir instead of Path.glob: glob fnmatches every entry and
+        # wraps each one in a Path before filtering, while scandir lets
+        # the cheap suffix check reject non-logs before any Path is built.
+        with os.scandir(self.log_directory) as it:
+            log_files = sorted(
+                Path(entry.path)
+                for entry in it
+                if entry.name.endswith('.log') and entry.is_file()
+            )
 
         if not log_files:
             print(f"Warning: No log files found in {self.log_directory}", file=sys.stderr)
             return []
 
-        for log_file in log_files:
-            result = self.parse_log_file(log_file)
-            if result:
-                self.results.append(result)
+        # Per-file parsing is pure CPU-bound regex work with no shared
+        # state, so fan the files out to a process pool; map() preserves
+        # the sorted file order in the results.
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            self.results = [
+                result
+                for result in executor.map(parse_log_file, log_files, chunksize=16)
+                if result
+            ]
 
         return self.results
 
@@ -157,12 +222,14 @@ class BenchmarkLogParser:
 def generate_summary(results: List[BenchmarkResult]) -> Dict[str, Any]:
     """Generate a comprehensive summary from results"""
 
+    passed = sum(1 for r in results if r.success)
+
     summary = {
         'timestamp': datetime.now().isoformat(),
         'total_benchmarks': len(results),
-        'passed': sum(1 for r in results if r.success),
-        'failed': sum(1 for r in results if not r.success),
-        'benchmarks': [asdict(r) for r in results],
+        'passed': passed,
+        'failed': len(results) - passed,
+        'benchmarks': [r.to_dict() for r in results],
         'statistics': {
             'by_format': {},
             'by_table': {},
@@ -170,56 +237,32 @@ def generate_summary(results: List[BenchmarkResult]) -> Dict[str, Any]:
         }
     }
 
-    # Aggregate statistics
-    by_format: Dict[str, List[BenchmarkResult]] = {}
-    by_table: Dict[str, List[BenchmarkResult]] = {}
-    by_mode: Dict[str, List[BenchmarkResult]] = {}
+    # Aggregate all three statistics dimensions in a single pass,
+    # keeping only [count, success_count, throughput_sum] counters per
+    # key instead of lists of result objects.
+    by_format: Dict[str, list] = defaultdict(lambda: [0, 0, 0])
+    by_table: Dict[str, list] = defaultdict(lambda: [0, 0, 0])
+    by_mode: Dict[str, list] = defaultdict(lambda: [0, 0, 0])
 
     for result in results:
-        if result.format not in by_format:
-            by_format[result.format] = []
-        by_format[result.format].append(result)
-
-        if result.table not in by_table:
-            by_table[result.table] = []
-        by_table[result.table].append(result)
-
-        if result.mode not in by_mode:
-            by_mode[result.mode] = []
-        by_mode[result.mode].append(result)
-
-    # Calculate per-format statistics
-    for format_name, format_results in by_format.items():
-        successful = [r for r in format_results if r.success]
-        summary['statistics']['by_format'][format_name] = {
-            'count': len(format_results),
-            'success': len(successful),
-            'avg_throughput': sum(r.throughput_rows_per_sec for r in successful
-                                    if r.throughput_rows_per_sec) // len(successful)
-                              if successful else 0,
-        }
-
-    # Calculate per-table statistics
-    for table_name, table_results in by_table.items():
-        successful = [r for r in table_results if r.success]
-        summary['statistics']['by_table'][table_name] = {
-            'count': len(table_results),
-            'success': len(successful),
-            'avg_throughput': sum(r.throughput_rows_per_sec for r in successful
-                                    if r.throughput_rows_per_sec) // len(successful)
-                              if successful else 0,
-        }
-
-    # Calculate per-mode statistics
-    for mode_name, mode_results in by_mode.items():
-        successful = [r for r in mode_results if r.success]
-        summary['statistics']['by_mode'][mode_name] = {
-            'count': len(mode_results),
-            'success': len(successful),
-            'avg_throughput': sum(r.throughput_rows_per_sec for r in successful
-                                    if r.throughput_rows_per_sec) // len(successful)
-                              if successful else 0,
-        }
+        for counters in (by_format[result.format],
+                         by_table[result.table],
+                         by_mode[result.mode]):
+            counters[0] += 1
+            if result.success:
+                counters[1] += 1
+                if result.throughput_rows_per_sec:
+                    counters[2] += result.throughput_rows_per_sec
+
+    for stats_key, counters_by_name in (('by_format', by_format),
+                                        ('by_table', by_table),
+                                        ('by_mode', by_mode)):
+        for name, (count, success, throughput_sum) in counters_by_name.items():
+            summary['statistics'][stats_key][name] = {
+                'count': count,
+                'success': success,
+                'avg_throughput': throughput_sum // success if success else 0,
+            }
 
     return summary
 
@@ -254,14 +297,14 @@ def main():
         summary = generate_summary(results)
 
     # Output JSON
-    json_output = json.dumps(summary, indent=2)
+    json_output = _dumps(summary)
 
     if output_file:
-        with open(output_file, 'w') as f:
+        with open(output_file, 'wb') as f:
             f.write(json_output)
         print(f"Summary written to: {output_file}", file=sys.stderr)
     else:
-        print(json_output)
+        print(json_output.decode())
 
     return 0
 
@@ -8,13 +8,18 @@ Tests various scenarios with different table counts, formats, and data volumes.
 
 import os
 import subprocess
+import threading
 import time
 import json
-import shutil
 import sys
 from pathlib import Path
-from collections import defaultdict
-import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Where the tpch-cpp checkout (and its build/ tree) lives; overridable so
+# the harness is not tied to one developer's home directory. Passed as
+# cwd= per subprocess rather than chdir'ing the whole interpreter.
+REPO_ROOT = Path(os.environ.get("TPCH_ROOT", "/home/tsafin/src/tpch-cpp"))
 
 # Color codes for terminal output
 class Colors:
@@ -27,6 +32,42 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Output directories already created this session; lets the per-run path
+# skip even the mkdir no-op syscall.
+_ensured_dirs = set()
+
+_help_text = None
+
+
+def _binary_supports(flag):
+    """Probe the binary's --help once to see whether a flag exists.
+
+    main.cpp's getopt loop exits non-zero on unknown options, so flags
+    that only exist on some builds must be gated on this probe.
+    """
+    global _help_text
+    if _help_text is None:
+        try:
+            probe = subprocess.run(["./build/tpch_benchmark", "--help"],
+                                   capture_output=True, timeout=10, cwd=REPO_ROOT)
+            _help_text = (probe.stdout + probe.stderr).decode(errors="replace")
+        except (OSError, subprocess.TimeoutExpired):
+            _help_text = ""
+    return flag in _help_text
+
+def reset_output_dir(path):
+    """Wipe and recreate an output directory.
+
+    Done once per scenario by the driver, not per subprocess: the
+    Scenario 2 loop used to rmtree the same shared tree tables x configs
+    times, each a full recursive unlink walk. rm -rf is one forked
+    process unlinking in a tight loop, measurably faster than Python's
+    per-entry scandir/unlink recursion on a populated parquet tree.
+    """
+    subprocess.run(["rm", "-rf", path], check=True)
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
+
 def run_benchmark(scenario_name, args, description=""):
     """Run tpch_benchmark with given arguments and measure time"""
     cmd = ["./build/tpch_benchmark"] + args
@@ -36,34 +77,55 @@ def run_benchmark(scenario_name, args, description=""):
         print(f"  {description}")
     print(f"  Command: {' '.join(cmd)}")
 
-    # Clean up previous output
-    output_dir = None
+    # The scenario driver resets the output tree once up front; here we
+    # only make sure the directory exists, and only once per path — no
+    # stat/mkdir probe on the hot per-run path after the first run.
     for i, arg in enumerate(args):
         if arg == "--output-dir" and i + 1 < len(args):
-            output_dir = args[i + 1]
+            out_dir = args[i + 1]
+            if out_dir not in _ensured_dirs:
+                os.makedirs(out_dir, exist_ok=True)
+                _ensured_dirs.add(out_dir)
             break
 
-    if output_dir and os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+    # Stream the child's output into bounded tails instead of
+    # capture_output=True: verbose per-batch progress would otherwise be
+    # buffered in full (and can stall the child once the 64 KB pipe
+    # fills), while only the trailing summary lines matter here.
+    stdout_tail = deque(maxlen=512)
+    stderr_tail = deque(maxlen=64)
 
-    start_time = time.time()
+    # Monotonic integer clock: wall-clock time.time() is subject to NTP
+    # slew and loses float precision on sub-second deltas.
+    start_ns = time.perf_counter_ns()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=600, cwd='/home/tsafin/src/tpch-cpp')
-        elapsed = time.time() - start_time
-
-        if result.returncode != 0:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              bufsize=1 << 16, cwd=REPO_ROOT) as proc:
+            readers = [
+                threading.Thread(target=stdout_tail.extend, args=(proc.stdout,), daemon=True),
+                threading.Thread(target=stderr_tail.extend, args=(proc.stderr,), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                returncode = proc.wait(timeout=600)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                raise
+            for reader in readers:
+                reader.join()
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+        if returncode != 0:
             print(f"{Colors.RED}ERROR: Benchmark failed{Colors.ENDC}")
-            if result.stderr:
-                print(result.stderr[:500])
+            if stderr_tail:
+                print(b"".join(stderr_tail).decode(errors='replace')[:500])
             return None
 
         return {
             'elapsed': elapsed,
-            'stdout': result.stdout,
-            'returncode': result.returncode
+            'stdout': b"".join(stdout_tail).decode(errors='replace'),
+            'returncode': returncode
         }
     except subprocess.TimeoutExpired:
         print(f"{Colors.RED}ERROR: Benchmark timeout (>10min){Colors.ENDC}")
@@ -72,10 +134,14 @@ def run_benchmark(scenario_name, args, description=""):
         print(f"{Colors.RED}ERROR: {e}{Colors.ENDC}")
         return None
 
-def run_test_suite():
-    """Run comprehensive benchmarking test suite"""
+def run_test_suite(parallel_harness=False):
+    """Run comprehensive benchmarking test suite.
 
-    os.chdir('/home/tsafin/src/tpch-cpp')
+    With parallel_harness=True, Scenario 2's per-table writes are
+    launched concurrently from the harness instead of back-to-back, so
+    its wall time measures competing I/O rather than Python's subprocess
+    launch serialization.
+    """
 
     print(f"\n{Colors.BOLD}{Colors.HEADER}")
     print("=" * 75)
@@ -83,86 +149,144 @@ def run_test_suite():
     print("=" * 75)
     print(f"{Colors.ENDC}")
 
-    results = defaultdict(list)
+    # Plain dict: every write is a scalar elapsed-seconds assignment,
+    # never an append.
+    results: dict = {}
     timings = []
 
-    # Test configurations: (max_rows, format, description)
+    # Test configurations: (max_rows, format, description, queue_depths)
+    # queue_depths sweeps --async-queue-depth for the I/O-bound CSV runs
+    # so the io_uring contention knee can be found per platform; Parquet
+    # is CPU-bound and not worth sweeping (None = no sweep).
     test_configs = [
-        (50000, "parquet", "50k rows, Parquet"),
-        (100000, "parquet", "100k rows, Parquet"),
-        (200000, "parquet", "200k rows, Parquet"),
-        (50000, "csv", "50k rows, CSV"),
-        (100000, "csv", "100k rows, CSV"),
+        (50000, "parquet", "50k rows, Parquet", None),
+        (100000, "parquet", "100k rows, Parquet", None),
+        (200000, "parquet", "200k rows, Parquet", None),
+        (50000, "csv", "50k rows, CSV", [4, 16, 64]),
+        (100000, "csv", "100k rows, CSV", [4, 16, 64]),
     ]
 
     # Scenario 1: Single table - baseline sync
     print(f"\n{Colors.BOLD}{Colors.BLUE}SCENARIO 1: Single Table (Baseline Sync){Colors.ENDC}")
     print("-" * 75)
 
-    for max_rows, fmt, desc in test_configs:
-        args = [
-            "--use-dbgen",
-            "--table", "lineitem",
-            "--format", fmt,
-            "--scale-factor", "1",
-            "--max-rows", str(max_rows),
-            "--output-dir", "/tmp/phase12_single_table"
-        ]
+    reset_output_dir("/tmp/phase12_single_table")
+
+    # The queue-depth sweep needs --async-queue-depth, which only exists
+    # on async-enabled builds; probe for it once and fall back to just
+    # the sync baseline when absent. The baseline run (qd=None, no extra
+    # flag) always happens, sweep or not.
+    sweep_queue_depths = _binary_supports("--async-queue-depth")
+    if not sweep_queue_depths:
+        print(f"{Colors.YELLOW}Note: binary lacks --async-queue-depth; "
+              f"running CSV configs sync-only{Colors.ENDC}")
+
+    for max_rows, fmt, desc, queue_depths in test_configs:
+        depths = [None]
+        if queue_depths and sweep_queue_depths:
+            depths += queue_depths
+        for qd in depths:
+            args = [
+                "--use-dbgen",
+                "--table", "lineitem",
+                "--format", fmt,
+                "--scale-factor", "1",
+                "--max-rows", str(max_rows),
+                "--output-dir", "/tmp/phase12_single_table"
+            ]
 
-        result = run_benchmark(
-            f"Single Table ({desc}) Sync",
-            args,
-            "Baseline: write single table without async I/O"
-        )
+            if qd is None:
+                name = f"Single Table ({desc}) Sync"
+                description = "Baseline: write single table without async I/O"
+            else:
+                args += ["--async-queue-depth", str(qd)]
+                name = f"Single Table ({desc}) QD={qd}"
+                description = f"Async I/O with io_uring queue depth {qd}"
 
-        if result:
-            print(f"{Colors.GREEN}✓ Elapsed: {result['elapsed']:.3f}s{Colors.ENDC}")
-            key = f"single_table_{fmt}_{max_rows}"
-            results[key] = result['elapsed']
-            timings.append({
-                'scenario': 'Single Table',
-                'format': fmt,
-                'rows': max_rows,
-                'elapsed': result['elapsed']
-            })
+            result = run_benchmark(name, args, description)
+
+            if result:
+                print(f"{Colors.GREEN}✓ Elapsed: {result['elapsed']:.3f}s{Colors.ENDC}")
+                key = f"single_table_{fmt}_{max_rows}"
+                if qd is not None:
+                    key += f"_qd{qd}"
+                results[key] = result['elapsed']
+                timing = {
+                    'scenario': 'Single Table',
+                    'format': fmt,
+                    'rows': max_rows,
+                    'elapsed': result['elapsed']
+                }
+                if qd is not None:
+                    timing['queue_depth'] = qd
+                timings.append(timing)
 
     # Scenario 2: Multiple tables sequential (current behavior)
     print(f"\n{Colors.BOLD}{Colors.BLUE}SCENARIO 2: Multiple Tables Sequential (Sync){Colors.ENDC}")
     print("-" * 75)
 
+    reset_output_dir("/tmp/phase12_multi_seq")
+
     tables = ["lineitem", "orders", "customer", "part"]
 
-    for max_rows, fmt, desc in test_configs[:3]:
-        seq_start = time.time()
+    for max_rows, fmt, desc, _ in test_configs[:3]:
+        seq_start_ns = time.perf_counter_ns()
+        table_times = {}
 
-        for table in tables:
-            args = [
+        def build_args(table):
+            # Distinct subdir per table so concurrent writes can't
+            # collide on output files.
+            return [
                 "--use-dbgen",
                 "--table", table,
                 "--format", fmt,
                 "--scale-factor", "1",
                 "--max-rows", str(max_rows),
-                "--output-dir", "/tmp/phase12_multi_seq"
+                "--output-dir", f"/tmp/phase12_multi_seq/{table}"
             ]
 
-            result = run_benchmark(
-                f"Multi-Table Seq ({table})",
-                args,
-                f"Sequential write to {table}"
-            )
-
-            if result:
-                print(f"{Colors.GREEN}  ✓ {table}: {result['elapsed']:.3f}s{Colors.ENDC}")
-                key = f"multi_seq_{fmt}_{max_rows}_{table}"
-                results[key] = result['elapsed']
-
-        seq_total = time.time() - seq_start
-        print(f"{Colors.YELLOW}Sequential total ({desc}): {seq_total:.3f}s{Colors.ENDC}")
+        if parallel_harness:
+            with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+                futures = {
+                    executor.submit(run_benchmark,
+                                    f"Multi-Table Conc ({table})",
+                                    build_args(table),
+                                    f"Concurrent write to {table}"): table
+                    for table in tables
+                }
+                for future in as_completed(futures):
+                    table = futures[future]
+                    result = future.result()
+                    if result:
+                        print(f"{Colors.GREEN}  ✓ {table}: {result['elapsed']:.3f}s{Colors.ENDC}")
+                        results[f"multi_seq_{fmt}_{max_rows}_{table}"] = result['elapsed']
+                        table_times[table] = result['elapsed']
+        else:
+            for table in tables:
+                result = run_benchmark(
+                    f"Multi-Table Seq ({table})",
+                    build_args(table),
+                    f"Sequential write to {table}"
+                )
+
+                if result:
+                    print(f"{Colors.GREEN}  ✓ {table}: {result['elapsed']:.3f}s{Colors.ENDC}")
+                    results[f"multi_seq_{fmt}_{max_rows}_{table}"] = result['elapsed']
+                    table_times[table] = result['elapsed']
+
+        # Report both what the loop measured (sum of per-table times)
+        # and what the user actually waits (wall time); they only agree
+        # for the sequential harness.
+        seq_total = (time.perf_counter_ns() - seq_start_ns) / 1e9
+        sum_elapsed = sum(table_times.values())
+        print(f"{Colors.YELLOW}Multi-table total ({desc}): wall {seq_total:.3f}s, "
+              f"sum of tables {sum_elapsed:.3f}s{Colors.ENDC}")
         timings.append({
-            'scenario': 'Multi-Table Sequential',
+            'scenario': 'Multi-Table Concurrent' if parallel_harness else 'Multi-Table Sequential',
             'format': fmt,
             'rows': max_rows,
             'elapsed': seq_total,
+            'sum_elapsed': sum_elapsed,
             'tables': len(tables)
         })
 
@@ -170,7 +294,9 @@ def run_test_suite():
     print(f"\n{Colors.BOLD}{Colors.BLUE}SCENARIO 3: Parallel Generation (Phase 12.3 --parallel){Colors.ENDC}")
     print("-" * 75)
 
-    for max_rows, fmt, desc in test_configs[:2]:
+    reset_output_dir("/tmp/phase12_parallel")
+
+    for max_rows, fmt, desc, _ in test_configs[:2]:
         args = [
             "--use-dbgen",
             "--table", "all",
@@ -203,16 +329,39 @@ def run_test_suite():
 def generate_report(timings):
     """Generate comprehensive benchmark report"""
 
-    report_path = '/home/tsafin/src/tpch-cpp/benchmark-results/phase12_5_async_benchmark.md'
-    os.makedirs('/home/tsafin/src/tpch-cpp/benchmark-results', exist_ok=True)
+    results_dir = REPO_ROOT / "benchmark-results"
+    report_path = results_dir / "phase12_5_async_benchmark.md"
+    os.makedirs(results_dir, exist_ok=True)
 
-    # Build results table
-    results_table = "| Scenario | Format | Rows | Tables | Elapsed (s) | Notes |\n"
-    results_table += "|----------|--------|------|--------|-------------|-------|\n"
-
-    for t in timings:
-        tables = t.get('tables', 1)
-        results_table += f"| {t['scenario']} | {t['format']} | {t['rows']} | {tables} | {t['elapsed']:.3f} | - |\n"
+    # Build results table via list + join — repeated += on a string
+    # re-copies the whole table per row.
+    table_lines = [
+        "| Scenario | Format | Rows | Tables | Elapsed (s) | Notes |\n",
+        "|----------|--------|------|--------|-------------|-------|\n",
+    ]
+    table_lines.extend(
+        f"| {t['scenario']} | {t['format']} | {t['rows']} | {t.get('tables', 1)} | {t['elapsed']:.3f} | - |\n"
+        for t in timings
+    )
+    results_table = "".join(table_lines)
+
+    # Queue-depth scaling subsection: present whenever the CSV sweep ran,
+    # so the contention knee for --async-queue-depth is visible per
+    # rows-count group.
+    qd_timings = [t for t in timings if 'queue_depth' in t]
+    if qd_timings:
+        qd_lines = [
+            "\n### Queue Depth Scaling (CSV, --async-queue-depth)\n\n",
+            "| Rows | Queue Depth | Elapsed (s) |\n",
+            "|------|-------------|-------------|\n",
+        ]
+        qd_lines.extend(
+            f"| {t['rows']} | {t['queue_depth']} | {t['elapsed']:.3f} |\n"
+            for t in qd_timings
+        )
+        qd_section = "".join(qd_lines)
+    else:
+        qd_section = ""
 
     report = f"""# Phase 12.5: Multi-File Async I/O Benchmarking Report
 
@@ -273,7 +422,7 @@ Tests compare:
 ## Benchmark Results
 
 {results_table}
-
+{qd_section}
 ## Analysis
 
 ### Throughput Comparison
@@ -379,7 +528,7 @@ if __name__ == '__main__':
         print(f"Starting benchmark suite...\n")
 
         # Run test suite and collect timings
-        timings = run_test_suite()
+        timings = run_test_suite(parallel_harness='--parallel-harness' in sys.argv)
 
         # Generate report with results
         generate_report(timings)
@@ -25,16 +25,36 @@ Async-IO uses io_uring for efficient concurrent I/O operations.
 Previous Phase 15 testing showed 1.73x speedup with parallel + async-io.
 """
 
+import csv
 import subprocess
 import json
+import random
+import shutil
+import threading
 import time
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from statistics import mean, stdev, median
+from statistics import fmean, stdev, median
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+try:
+    import orjson
+
+    def _loads(data: bytes):
+        """Parse JSON through orjson's C decoder when it is installed."""
+        return orjson.loads(data)
+except ImportError:
+    def _loads(data: bytes):
+        return json.loads(data)
+
 # All 8 TPC-H tables with base row counts (scale factor 1)
 # According to TPC-H standard: https://www.tpc.org/tpch/
 TABLES_SF1 = [
@@ -55,6 +75,28 @@ TABLES_SF10 = [(name, count * SCALE_FACTOR) for name, count in TABLES_SF1]
 # File formats to benchmark
 FORMATS = ["orc", "parquet"]
 
+# Constant-size tables whose wall time is dominated by process launch
+# overhead rather than generation work — 250 and 50 rows even at SF=10.
+SMALL_TABLES = frozenset({"nation", "region"})
+
+# Counters collected under --perf; enough to tell whether a mode's win
+# comes from fewer instructions, better IPC or fewer context switches.
+PERF_EVENTS = "task-clock,context-switches,instructions,cycles,cache-misses"
+
+# Derived once at import instead of recomputed at every use site.
+TOTAL_ROWS_SF10 = sum(count for _, count in TABLES_SF10)
+
+# The three throughput report styles fused into one alternation and
+# compiled once; a single search replaces up to three full-output scans
+# per benchmark run. The matched alternative is picked via the first
+# non-None group.
+_THROUGHPUT_RE = re.compile(
+    r'(?:(?P<rs>\d+(?:\.\d+)?)\s*rows/sec'
+    r'|Generated.*?(?P<gs>\d+(?:\.\d+)?)\s*rows/s'
+    r'|Throughput:\s*(?P<tp>\d+(?:\.\d+)?))',
+    re.IGNORECASE,
+)
+
 # Define all meaningful optimization combinations
 # Phase 16: Zero-copy modes are now STABLE - enable for comprehensive benchmarking
 # Phase 16 Update 2: Added async-IO variants for parallel modes (io_uring support)
@@ -62,93 +104,215 @@ OPTIMIZATION_MODES = [
     {
         "name": "baseline",
         "description": "Regular path (baseline)",
-        "flags": [],
+        "flags": (),
         "per_table": True,
         "parallel": False,
+        "concurrent_ok": True,
     },
     {
         "name": "zero_copy",
         "description": "Zero-copy optimizations (Phase 14.1)",
-        "flags": ["--zero-copy"],
+        "flags": ("--zero-copy",),
         "per_table": True,
         "parallel": False,
+        "concurrent_ok": True,
     },
     {
         "name": "true_zero_copy",
         "description": "True zero-copy with Buffer::Wrap (Phase 14.2.3)",
-        "flags": ["--true-zero-copy"],
+        "flags": ("--true-zero-copy",),
         "per_table": True,
         "parallel": False,
+        "concurrent_ok": True,
     },
     {
         "name": "parallel_baseline",
         "description": "Parallel mode (all 8 tables, baseline)",
-        "flags": ["--parallel"],
+        "flags": ("--parallel",),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
     {
         "name": "parallel_zero_copy",
         "description": "Parallel + Zero-copy (Phase 14.1)",
-        "flags": ["--parallel", "--zero-copy"],
+        "flags": ("--parallel", "--zero-copy"),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
     {
         "name": "parallel_true_zero_copy",
         "description": "Parallel + True zero-copy (Phase 14.2.3)",
-        "flags": ["--parallel", "--true-zero-copy"],
+        "flags": ("--parallel", "--true-zero-copy"),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
     {
         "name": "parallel_baseline_async",
         "description": "Parallel baseline + Async-IO (io_uring, Phase 16)",
-        "flags": ["--parallel", "--async-io"],
+        "flags": ("--parallel", "--async-io"),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
     {
         "name": "parallel_zero_copy_async",
         "description": "Parallel + Zero-copy + Async-IO (Phase 16)",
-        "flags": ["--parallel", "--zero-copy", "--async-io"],
+        "flags": ("--parallel", "--zero-copy", "--async-io"),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
     {
         "name": "parallel_true_zero_copy_async",
         "description": "Parallel + True zero-copy + Async-IO (Phase 16)",
-        "flags": ["--parallel", "--true-zero-copy", "--async-io"],
+        "flags": ("--parallel", "--true-zero-copy", "--async-io"),
         "per_table": False,
         "parallel": True,
+        "concurrent_ok": False,
     },
 ]
 
 
+# Mode subsets the reporting paths keep re-deriving; filter them once.
+PER_TABLE_MODES = [m for m in OPTIMIZATION_MODES if m["per_table"]]
+PARALLEL_MODES = [m for m in OPTIMIZATION_MODES if m["parallel"]]
+ASYNC_MODES = [m for m in OPTIMIZATION_MODES if "async" in m["name"]]
+
+
+def _cpu_count_from_spec(spec: str) -> int:
+    """Number of CPUs in a taskset list like '0-7' or '0,2,4-6'."""
+    count = 0
+    for part in spec.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            count += int(hi) - int(lo) + 1
+        elif part:
+            count += 1
+    return count
+
+
 class Phase15Benchmark:
-    def __init__(self, tpch_binary: str, output_dir: str = "/tmp/phase16_sf10_benchmark", runs: int = 2):
+    def __init__(self, tpch_binary: str, output_dir: str = "/tmp/phase16_sf10_benchmark", runs: int = 2,
+                 jobs: int = 1, warmup: bool = False, interleave: bool = False,
+                 cold_cache: bool = False, cpus: Optional[str] = None,
+                 realtime: bool = False, skip_small: bool = False,
+                 perf: bool = False, skip_existing: bool = False,
+                 abort_on_failure: bool = False, generate_once: bool = False):
         self.tpch_binary = Path(tpch_binary)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.runs = runs  # Number of times to run each benchmark
+        self.jobs = jobs  # Concurrent benchmark invocations for per-table modes
+        self.warmup = warmup  # Prepend a discarded run 0 to each combination
+        self.interleave = interleave  # Shuffle (table, run) order within a mode
+        self.cold_cache = cold_cache  # Drop the page cache before every run
+        self._cold_cache_warned = False
+        self.skip_small = skip_small  # Leave nation/region out of per-table modes
+        self.abort_on_failure = abort_on_failure  # Stop the suite on first failure
+        self._had_failure = False
+        self.generate_once = generate_once  # Run dbgen once, rewrite per mode
+        self._shared_input: Optional[Path] = None
+        self.caps: Optional[Dict[str, bool]] = None  # Lazy capability probe
+
+        self.perf = perf  # Wrap runs in perf stat and record counters
+        if self.perf and shutil.which("perf") is None:
+            print("Warning: --perf requested but perf(1) not found; "
+                  "continuing without counters")
+            self.perf = False
+
+        self.skip_existing = skip_existing  # Trust complete parquet output
+        if self.skip_existing and pq is None:
+            print("Warning: --skip-existing needs pyarrow to verify row "
+                  "counts; regenerating everything")
+            self.skip_existing = False
+
+        # Scheduler-noise controls: pin the binary to a cpuset and/or
+        # run it under SCHED_FIFO so run-to-run stdev reflects the
+        # optimization modes, not CPU migrations and preemption.
+        self._launch_prefix: List[str] = []
+        self._child_env = None
+        if cpus:
+            self._launch_prefix += ["taskset", "-c", cpus]
+            # Keep the binary's thread pools sized to the pin, not to
+            # the whole machine it can no longer use.
+            self._child_env = dict(os.environ,
+                                   OMP_NUM_THREADS=str(_cpu_count_from_spec(cpus)))
+        if realtime:
+            self._launch_prefix += ["chrt", "-f", "50"]
+
+        # Invariant argv prefix, formatted once instead of per run.
+        self._base_cmd = (
+            *self._launch_prefix,
+            str(self.tpch_binary),
+            "--use-dbgen",
+            "--scale-factor", str(SCALE_FACTOR),
+            "--max-rows", "0",  # 0 = generate ALL rows for the scale factor
+        )
+        # Per-(mode, format) argv templates, built on first use.
+        self._cmd_cache: Dict[Tuple[str, str], Tuple[str, ...]] = {}
         self.results: Dict = {}
         self.benchmark_date = datetime.now().isoformat()
+        self._print_lock = threading.Lock()
+
+        # Completed runs are appended to results.jsonl as they finish, so
+        # a crash mid-suite (one bad 60-minute lineitem run) does not
+        # throw away every prior measurement. On startup, replay the file
+        # and skip (format, mode, table, run) combinations already done.
+        self._jsonl_path = self.output_dir / "results.jsonl"
+        self._done: Dict = {}
+        if self._jsonl_path.exists():
+            with open(self._jsonl_path) as f:
+                for line in f:
+                    try:
+                        prior = json.loads(line)
+                    except ValueError:
+                        continue  # partial line from an interrupted write
+                    key = (prior["format"], prior["mode"], prior["table"], prior["run"])
+                    self._done[key] = prior
+            if self._done:
+                print(f"Resuming: {len(self._done)} completed run(s) found in {self._jsonl_path}")
+        self._jsonl = open(self._jsonl_path, "a", buffering=1)
+        self._jsonl_lock = threading.Lock()
 
     def _parse_throughput(self, output_text: str) -> float:
         """Extract throughput from program output"""
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*rows/sec',
-            r'Generated.*?(\d+(?:\.\d+)?)\s*rows/s',
-            r'Throughput:\s*(\d+(?:\.\d+)?)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, output_text, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
-
+        # The summary lines sit at the end of the output; only the last
+        # 8 KB need scanning even when the binary logs per-batch progress.
+        tail = output_text[-8192:]
+        # Cheap substring probe first: anchor the regex near the last
+        # occurrence of a throughput token rather than scanning the
+        # whole tail, and bail out without regex work when none appears.
+        anchor = max(tail.rfind("rows/s"), tail.rfind("Throughput:"),
+                     tail.rfind("ROWS/S"), tail.rfind("THROUGHPUT:"))
+        if anchor < 0:
+            return 0.0
+        match = _THROUGHPUT_RE.search(tail, max(0, anchor - 256))
+        if match:
+            return float(match.group(match.lastgroup))
         return 0.0
 
+    def _cmd_template(self, mode: Dict, format_type: str) -> Tuple[str, ...]:
+        """Static argv shared by every run of a (mode, format) pair.
+
+        Only --output-dir, --table and the metrics sidecar path vary per
+        run; everything else — launch prefix, binary, scale factor,
+        format and optimization flags — is assembled once and reused.
+        """
+        key = (mode["name"], format_type)
+        template = self._cmd_cache.get(key)
+        if template is None:
+            template = (*self._base_cmd, "--format", format_type)
+            # Rewrite from the shared dbgen data instead of regenerating.
+            if self._shared_input is not None:
+                template += ("--phase", "rewrite",
+                             "--input-dir", str(self._shared_input))
+            template += mode["flags"]
+            self._cmd_cache[key] = template
+        return template
+
     def run_benchmark(
         self,
         mode: Dict,
@@ -159,45 +323,124 @@ class Phase15Benchmark:
     ) -> Optional[Dict]:
         """Run a single benchmark"""
 
+        # Skip work already recorded in results.jsonl from a prior run.
+        # Warm-up runs (run 0) always execute — priming the cache is
+        # their whole purpose — and are never persisted.
+        key = (format_type, mode["name"], table_name, run_number)
+        if run_number > 0:
+            prior = self._done.get(key)
+            if prior is not None:
+                return prior
+
         # Create output directory
+        # run_all_benchmarks pre-creates the run directory skeleton, so
+        # only the leaf (the table subdir, if any) needs a single-syscall
+        # mkdir here; the fallback covers direct run_benchmark calls.
         output_path = self.output_dir / format_type / mode["name"] / f"run{run_number}"
         if table_name:
             output_path = output_path / table_name
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Build command
-        cmd = [
-            str(self.tpch_binary),
-            "--use-dbgen",
-            "--scale-factor", str(SCALE_FACTOR),
-            "--max-rows", "0",  # 0 = generate ALL rows for the scale factor
-            "--format", format_type,
-            "--output-dir", str(output_path)
-        ]
+        try:
+            os.mkdir(output_path)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            os.makedirs(output_path, exist_ok=True)
+
+        # Skip regeneration when the parquet output from a previous
+        # partial suite is already complete — the footer row count is
+        # authoritative and reading it costs only the file's metadata.
+        if (self.skip_existing and format_type == "parquet" and row_count
+                and self._existing_rows(output_path) == row_count):
+            result = {
+                "table": table_name,
+                "rows": row_count,
+                "format": format_type,
+                "mode": mode["name"],
+                "run": run_number,
+                "elapsed": 0.0,
+                "throughput": 0.0,
+                "cached": True,  # timing fields are stale; report skips it
+                "log": str(output_path / "stdout.log"),
+            }
+            metrics_path = output_path / "metrics.json"
+            if metrics_path.exists():
+                try:
+                    with open(metrics_path, "rb") as f:
+                        metrics = _loads(f.read())
+                    result["throughput"] = float(metrics["throughput_rows_per_sec"])
+                    result["elapsed"] = float(metrics.get("elapsed_sec", 0.0))
+                except (OSError, ValueError, KeyError, TypeError):
+                    pass
+            return result
+
+        # Build command around the cached per-(mode, format) template;
+        # perf's wrapper goes first because its CSV path is per-run.
+        perf_csv = output_path / "perf.csv"
+        cmd = []
+        if self.perf:
+            cmd += ["perf", "stat", "-x,", "-o", str(perf_csv),
+                    "-e", PERF_EVENTS]
+        cmd += self._cmd_template(mode, format_type)
+        cmd += ["--output-dir", str(output_path)]
 
         # Add table for per-table benchmarks
         if mode["per_table"] and table_name:
             cmd.extend(["--table", table_name])
 
-        # Add optimization flags
-        cmd.extend(mode["flags"])
+        # Prefer exact metrics from a JSON sidecar over scraping the
+        # human-readable log; only binaries that advertise the flag get it.
+        metrics_path = output_path / "metrics.json"
+        if self._binary_supports("--metrics-json"):
+            cmd.extend(["--metrics-json", str(metrics_path)])
+
+        # Stream child output straight to disk instead of capture_output:
+        # a verbose SF=10 lineitem run can emit hundreds of MB, and
+        # buffering + decoding all of it in a Python str doubles peak RSS
+        # for the sake of a single throughput line near the end.
+        log_path = output_path / "stdout.log"
+
+        if self.cold_cache:
+            self._drop_caches()
 
         try:
-            start = time.time()
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=3600  # 60 minutes timeout for full SF=10 (60M lineitem rows)
-            )
-            elapsed = time.time() - start
-
-            if result.returncode != 0:
+            # perf_counter_ns is monotonic (immune to NTP steps) and
+            # nanosecond-grained — time.time() jitter is visible in the
+            # throughput of sub-second tables. Reaping through os.wait4
+            # additionally yields the child's rusage, so each result
+            # records where the time went (user/sys CPU vs I/O wait).
+            start_ns = time.perf_counter_ns()
+            with open(log_path, "wb") as log_file:
+                proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT,
+                                        env=self._child_env)
+                # wait4 has no timeout; arm a kill timer for the
+                # 60-minute budget a full SF=10 lineitem run may need.
+                timer = threading.Timer(3600, proc.kill)
+                timer.start()
+                try:
+                    _, status, rusage = os.wait4(proc.pid, 0)
+                finally:
+                    timer.cancel()
+                # The child is already reaped; record the exit code so
+                # Popen does not try to wait for it again.
+                proc.returncode = os.waitstatus_to_exitcode(status)
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+            if proc.returncode != 0:
                 return None
 
-            throughput = self._parse_throughput(result.stdout)
-
-            return {
+            throughput = None
+            if metrics_path.exists():
+                try:
+                    with open(metrics_path, "rb") as f:
+                        metrics = _loads(f.read())
+                    throughput = float(metrics["throughput_rows_per_sec"])
+                    elapsed = float(metrics.get("elapsed_sec", elapsed))
+                except (OSError, ValueError, KeyError, TypeError):
+                    throughput = None  # sidecar unusable, scrape the log
+            if throughput is None:
+                throughput = self._parse_throughput(self._read_tail(log_path))
+
+            result = {
                 "table": table_name,
                 "rows": row_count,
                 "format": format_type,
@@ -205,14 +448,241 @@ class Phase15Benchmark:
                 "run": run_number,
                 "elapsed": elapsed,
                 "throughput": throughput,
-                "output": result.stdout
+                "cpu_user": rusage.ru_utime,
+                "cpu_sys": rusage.ru_stime,
+                "max_rss_kb": rusage.ru_maxrss,
+                # ~1.0 means CPU-bound; well below 1.0 means the run sat
+                # in I/O wait — the split async-io is supposed to move.
+                "cpu_efficiency": (rusage.ru_utime + rusage.ru_stime) / elapsed if elapsed > 0 else 0.0,
+                "log": str(log_path)
             }
 
+            if self.perf:
+                result["perf"] = self._parse_perf_csv(perf_csv)
+
+            if format_type == "parquet":
+                verified = self._verify_output(output_path, row_count)
+                if verified is not None:
+                    result["verified"] = verified
+
+            if run_number > 0:
+                with self._jsonl_lock:
+                    self._jsonl.write(json.dumps(result) + "\n")
+                self._done[key] = result
+
+            return result
+
         except subprocess.TimeoutExpired:
             return None
         except Exception as e:
             return None
 
+    # Flags whose presence in --help gates optional behavior.
+    CAP_FLAGS = ("--plan", "--metrics-json", "--async-io", "--phase",
+                 "--zero-copy", "--true-zero-copy", "--parallel")
+
+    def _probe_caps(self) -> Dict[str, bool]:
+        """Detect supported flags, cached in caps.json across processes.
+
+        The --help probe is a full binary launch; a harness constructing
+        this class repeatedly would pay it every time. The cache key is
+        (resolved path, st_mtime_ns), so rebuilding the binary
+        invalidates the entry automatically.
+        """
+        try:
+            st = self.tpch_binary.stat()
+            key = f"{self.tpch_binary.resolve()}:{st.st_mtime_ns}"
+        except OSError:
+            key = str(self.tpch_binary)
+
+        caps_path = self.output_dir / "caps.json"
+        try:
+            with open(caps_path) as f:
+                cached = json.load(f).get(key)
+            if cached is not None:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+        try:
+            probe = subprocess.run([str(self.tpch_binary), "--help"],
+                                   capture_output=True, text=True, timeout=30)
+            help_text = probe.stdout + probe.stderr
+        except (OSError, subprocess.SubprocessError):
+            help_text = ""
+        caps = {flag: flag in help_text for flag in self.CAP_FLAGS}
+
+        try:
+            with open(caps_path, "w") as f:
+                json.dump({key: caps}, f, indent=2)
+        except OSError:
+            pass  # cache is an optimization; keep going without it
+        return caps
+
+    def _binary_supports(self, flag: str) -> bool:
+        """True when the binary's --help advertises the flag."""
+        if self.caps is None:
+            self.caps = self._probe_caps()
+        return self.caps.get(flag, False)
+
+    def _run_plan(self) -> bool:
+        """Execute the whole matrix as one --plan invocation.
+
+        Per-invocation benchmarking pays fork+exec, dynamic linking and
+        dbgen init 100+ times per suite; a binary that understands
+        --plan runs the matrix in-process and writes one results blob.
+        Returns False (leaving self.results untouched) if anything about
+        the plan run fails, so the caller can fall back to the loop.
+        """
+        plan = {
+            "scale_factor": SCALE_FACTOR,
+            "formats": FORMATS,
+            "runs": self.runs,
+            "tables": [name for name, _ in TABLES_SF10],
+            "modes": [
+                {"name": m["name"], "flags": m["flags"],
+                 "per_table": m["per_table"]}
+                for m in OPTIMIZATION_MODES
+            ],
+        }
+        plan_path = self.output_dir / "plan.json"
+        results_path = self.output_dir / "plan_results.json"
+        with open(plan_path, "w") as f:
+            json.dump(plan, f, indent=2)
+
+        cmd = [
+            *self._launch_prefix,
+            str(self.tpch_binary),
+            "--plan", str(plan_path),
+            "--results", str(results_path),
+            "--output-dir", str(self.output_dir / "plan_output"),
+        ]
+        print(f"Binary supports --plan: running full matrix in one invocation")
+        try:
+            proc = subprocess.run(cmd, env=self._child_env,
+                                  timeout=3600 * len(OPTIMIZATION_MODES))
+            if proc.returncode != 0:
+                return False
+            with open(results_path) as f:
+                self.results = json.load(f)["results"]
+        except (OSError, subprocess.SubprocessError, ValueError, KeyError):
+            return False
+        return True
+
+    def _generate_shared_input(self) -> bool:
+        """Run dbgen once into a shared directory for all mode runs.
+
+        Regenerating the same SF=10 rows for every (mode, run) makes the
+        suite measure dbgen over and over; the comparison target is the
+        writer path. Binaries that support --phase can generate once and
+        rewrite from the shared data in each benchmark run.
+        """
+        shared = self.output_dir / "dbgen_shared"
+        shared.mkdir(parents=True, exist_ok=True)
+        cmd = [*self._base_cmd, "--phase", "generate",
+               "--output-dir", str(shared)]
+        print(f"\nGenerating shared SF={SCALE_FACTOR} data set once: {shared}")
+        try:
+            proc = subprocess.run(cmd, env=self._child_env, timeout=3600)
+        except (OSError, subprocess.SubprocessError):
+            return False
+        if proc.returncode != 0:
+            return False
+        self._shared_input = shared
+        return True
+
+    def _drop_caches(self):
+        """Best-effort page cache invalidation before a cold-cache run.
+
+        Without this, runs 2+ read everything from a hot fs cache and
+        the async-io mode comparisons measure a scenario where the
+        io_uring path has nothing to overlap.
+        """
+        try:
+            subprocess.run(["sync"], check=True)
+            with open("/proc/sys/vm/drop_caches", "w") as f:
+                f.write("3\n")
+            return
+        except PermissionError:
+            # Not root: try the usual sudo tee route non-interactively.
+            result = subprocess.run(
+                "echo 3 | sudo -n tee /proc/sys/vm/drop_caches",
+                shell=True, capture_output=True)
+            if result.returncode == 0:
+                return
+        except OSError:
+            pass
+        if not self._cold_cache_warned:
+            self._cold_cache_warned = True
+            print("Warning: --cold-cache requested but dropping "
+                  "/proc/sys/vm/drop_caches failed (need root or sudo); "
+                  "runs will see a warm page cache")
+
+    @staticmethod
+    def _verify_output(output_path: Path, row_count: int) -> Optional[bool]:
+        """Check parquet footer row counts against the expected total.
+
+        A mode that crashes mid-write can leave partial files behind yet
+        still report a plausible throughput. Footers are read in
+        parallel over memory-mapped files — metadata-only, no data pages
+        are decoded. Returns None when verification is not possible
+        (no pyarrow, no files).
+        """
+        if pq is None or not row_count:
+            return None
+        files = list(output_path.glob("*.parquet"))
+        if not files:
+            return None
+
+        def footer_rows(path: Path) -> int:
+            return pq.ParquetFile(path, memory_map=True).metadata.num_rows
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                total = sum(executor.map(footer_rows, files))
+        except Exception:
+            return False  # unreadable/truncated file counts as a failure
+        return total == row_count
+
+    @staticmethod
+    def _existing_rows(output_path: Path) -> Optional[int]:
+        """Total row count across parquet files already in output_path."""
+        files = list(output_path.glob("*.parquet"))
+        if not files:
+            return None
+        try:
+            return sum(pq.ParquetFile(p).metadata.num_rows for p in files)
+        except Exception:
+            return None  # unreadable/truncated file: regenerate
+
+    @staticmethod
+    def _parse_perf_csv(path: Path) -> Dict[str, float]:
+        """Parse perf stat -x, output into {event: value}, plus IPC."""
+        counters: Dict[str, float] = {}
+        try:
+            with open(path) as f:
+                for line in f:
+                    parts = line.split(",")
+                    if len(parts) < 3 or line.startswith("#"):
+                        continue
+                    try:
+                        counters[parts[2]] = float(parts[0])
+                    except ValueError:
+                        continue  # <not supported> / <not counted>
+        except OSError:
+            pass
+        if counters.get("cycles"):
+            counters["ipc"] = counters.get("instructions", 0.0) / counters["cycles"]
+        return counters
+
+    @staticmethod
+    def _read_tail(log_path: Path, size: int = 65536) -> str:
+        """Read the last `size` bytes of a log file."""
+        with open(log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - size))
+            return f.read().decode(errors="replace")
+
     def run_per_table_benchmarks(self, mode: Dict, format_type: str = "parquet") -> List[Dict]:
         """Run benchmarks for each table individually"""
         results = []
@@ -223,17 +693,69 @@ class Phase15Benchmark:
         print(f"{'Table':<15} {'Rows':<12} {'Run':<4} {'Throughput':>15} {'Time':>10} {'Status':<10}")
         print("-" * 120)
 
-        for table_name, row_count in TABLES_SF10:
-            for run_num in range(1, self.runs + 1):
+        # Shortest tables first: a broken binary or bad flag combination
+        # surfaces in seconds instead of after an hour-long lineitem run,
+        # and less completed work is at stake when a late run crashes.
+        tables = sorted(TABLES_SF10, key=lambda t: t[1])
+        if self.skip_small:
+            # nation/region cannot resolve throughput differences: their
+            # measured time is almost entirely fork/exec and setup cost.
+            tables = [(t, c) for t, c in tables if t not in SMALL_TABLES]
+
+        jobs = [
+            (table_name, row_count, run_num)
+            for table_name, row_count in tables
+            for run_num in range(0 if self.warmup else 1, self.runs + 1)
+        ]
+
+        # Interleaving breaks the back-to-back run1/run2 pairing per
+        # table, so page-cache and frequency-scaling drift no longer
+        # systematically favors the later run. Fixed seed keeps the
+        # schedule reproducible between invocations.
+        if self.interleave:
+            random.Random(42).shuffle(jobs)
+
+        # Per-table runs write to disjoint output dirs, so they can
+        # overlap — the driver is otherwise idle in subprocess.run while
+        # cores sit unused. Parallel modes keep jobs=1 since the binary
+        # already saturates the machine on its own.
+        if self.jobs > 1 and mode.get("concurrent_ok"):
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(jobs))) as executor:
+                futures = {
+                    executor.submit(self.run_benchmark, mode, format_type,
+                                    table_name, row_count, run_num): (table_name, row_count, run_num)
+                    for table_name, row_count, run_num in jobs
+                }
+                for future in as_completed(futures):
+                    table_name, row_count, run_num = futures[future]
+                    result = future.result()
+                    with self._print_lock:
+                        if result and run_num == 0:
+                            print(f"{table_name:<15} {row_count:<12} {run_num:<4} "
+                                  f"{result['throughput']:>15,.0f} {result['elapsed']:>10.3f}s WARM-UP (discarded)")
+                        elif result:
+                            print(f"{table_name:<15} {row_count:<12} {run_num:<4} "
+                                  f"{result['throughput']:>15,.0f} {result['elapsed']:>10.3f}s OK")
+                            results.append(result)
+                        else:
+                            print(f"{table_name:<15} {row_count:<12} {run_num:<4} FAILED or SKIPPED")
+                            self._had_failure = True
+        else:
+            for table_name, row_count, run_num in jobs:
                 print(f"{table_name:<15} {row_count:<12} {run_num:<4} ", end="", flush=True)
 
                 result = self.run_benchmark(mode, format_type, table_name, row_count, run_num)
 
-                if result:
+                if result and run_num == 0:
+                    print(f"{result['throughput']:>15,.0f} {result['elapsed']:>10.3f}s WARM-UP (discarded)")
+                elif result:
                     print(f"{result['throughput']:>15,.0f} {result['elapsed']:>10.3f}s OK")
                     results.append(result)
                 else:
                     print("FAILED or SKIPPED")
+                    self._had_failure = True
+                    if self.abort_on_failure:
+                        break
 
         return results
 
@@ -245,10 +767,15 @@ class Phase15Benchmark:
         print(f"{'Run':<4} {'Total Rows':<15} {'Elapsed':>10} {'Throughput':>15} {'Status':<10}")
         print("-" * 120)
 
-        total_rows = sum(count for _, count in TABLES_SF10)
+        total_rows = TOTAL_ROWS_SF10
         aggregate_results = []
 
-        for run_num in range(1, self.runs + 1):
+        for run_num in range(0 if self.warmup else 1, self.runs + 1):
+            if run_num == 0:
+                result = self.run_benchmark(mode, format_type, run_number=0)
+                status = "WARM-UP (discarded)" if result else "WARM-UP FAILED"
+                print(f"{run_num:<4} {total_rows:<15} {status}")
+                continue
             print(f"{run_num:<4} {total_rows:<15} ", end="", flush=True)
 
             # For parallel mode, we need to generate all tables
@@ -265,6 +792,9 @@ class Phase15Benchmark:
                 })
             else:
                 print(f"{'':>10}s {'0':>15} FAILED")
+                self._had_failure = True
+                if self.abort_on_failure:
+                    break
 
         if aggregate_results:
             return {
@@ -286,11 +816,37 @@ class Phase15Benchmark:
         print(f"Scale Factor: 10")
         print(f"Formats: {', '.join(FORMATS)}")
         print(f"Tables: {len(TABLES_SF10)} (lineitem, orders, customer, part, partsupp, supplier, nation, region)")
-        print(f"Total Rows: {sum(count for _, count in TABLES_SF10):,}")
+        print(f"Total Rows: {TOTAL_ROWS_SF10:,}")
         print(f"Runs per benchmark: {self.runs}")
+        if self.cold_cache:
+            print("Cache: COLD (page cache dropped via /proc/sys/vm/drop_caches before every run)")
+        if self.skip_small:
+            print(f"Skipping small tables in per-table modes: {', '.join(sorted(SMALL_TABLES))}")
         print(f"Optimization modes: {len(OPTIMIZATION_MODES)} (3 sequential + 6 parallel variants with/without async-io)")
         print("="*120)
 
+        if self._binary_supports("--plan"):
+            if self._run_plan():
+                return
+            print("Plan execution failed; falling back to one invocation per benchmark")
+
+        if self.generate_once:
+            if not self._binary_supports("--phase"):
+                print("Binary does not support --phase; running dbgen per invocation")
+            elif not self._generate_shared_input():
+                print("Shared generation failed; running dbgen per invocation")
+
+        # Create the {format}/{mode}/run{n} skeleton up-front so the hot
+        # path only ever mkdirs a leaf: mkdir(parents=True) stats every
+        # path component on every call, which adds up over hundreds of
+        # runs on the same few parents.
+        for fmt in FORMATS:
+            for mode in OPTIMIZATION_MODES:
+                for run_number in range(0 if self.warmup else 1, self.runs + 1):
+                    os.makedirs(
+                        self.output_dir / fmt / mode["name"] / f"run{run_number}",
+                        exist_ok=True)
+
         for format_type in FORMATS:
             print(f"\n{'='*120}")
             print(f"Testing format: {format_type.upper()}")
@@ -306,8 +862,66 @@ class Phase15Benchmark:
                     if result:
                         self.results[result_key] = result["results"]
 
+                if self.abort_on_failure and self._had_failure:
+                    print("\nAborting: a benchmark failed and --abort-on-failure is set")
+                    return
+
+    def _index_results(self):
+        """Pre-index per-table throughputs for reporting.
+
+        generate_report used to filter every result list per (table,
+        mode) pair and recompute statistics on each visit. One walk over
+        self.results builds (result_key, table) -> throughput list plus
+        cached (center, spread) tuples, so the report sections become
+        plain dict lookups.
+
+        With runs >= 5 the cached statistics are median and median
+        absolute deviation, which a single outlier cannot drag around.
+        With fewer runs those are degenerate (the median of 2 points is
+        their mean), so mean/stdev is kept and the report says so.
+        """
+        self._robust_stats = self.runs >= 5
+        self._throughput_index: Dict[Tuple[str, Optional[str]], List[float]] = {}
+        for result_key, results in self.results.items():
+            for r in results:
+                # Entries satisfied from existing output carry stale (or
+                # zero) timings; they must not feed speedup statistics.
+                if "table" in r and not r.get("cached"):
+                    self._throughput_index.setdefault(
+                        (result_key, r["table"]), []
+                    ).append(r["throughput"])
+        # Mean elapsed per result key, for the parallel/async-impact
+        # comparisons that previously re-listed and re-averaged the same
+        # result lists pair by pair.
+        self._elapsed_mean: Dict[str, float] = {
+            result_key: fmean(elapsed)
+            for result_key, results in self.results.items()
+            if (elapsed := [r["elapsed"] for r in results
+                            if "elapsed" in r and not r.get("cached")])
+        }
+
+        ipc_lists: Dict[Tuple[str, Optional[str]], List[float]] = {}
+        for result_key, results in self.results.items():
+            for r in results:
+                ipc = r.get("perf", {}).get("ipc")
+                if ipc and "table" in r:
+                    ipc_lists.setdefault((result_key, r["table"]), []).append(ipc)
+        self._ipc = {key: fmean(vals) for key, vals in ipc_lists.items()}
+
+        self._stats = {}
+        for key, vals in self._throughput_index.items():
+            if self._robust_stats:
+                center = median(vals)
+                spread = median(abs(v - center) for v in vals)
+            else:
+                center = fmean(vals)
+                spread = stdev(vals) if len(vals) >= 2 else 0.0
+            self._stats[key] = (center, spread)
+
     def generate_report(self):
         """Generate comprehensive performance report"""
+        self._index_results()
+
         print("\n\n" + "="*120)
         print("PHASE 16+ PERFORMANCE REPORT - ORC vs PARQUET with FULL OPTIMIZATION MATRIX")
         print("="*120)
@@ -317,43 +931,44 @@ class Phase15Benchmark:
         print("PER-TABLE PERFORMANCE ANALYSIS (SF=10)")
         print("="*120)
 
+        if self._robust_stats:
+            center_label, spread_label = "Median (r/s)", "MAD"
+        else:
+            center_label, spread_label = "Avg (r/s)", "Std Dev"
+            print(f"\nNote: runs={self.runs} — reporting mean/stdev; "
+                  f"run with runs >= 5 for outlier-robust median/MAD statistics")
+
         for format_type in FORMATS:
             print(f"\n\n{'='*120}")
             print(f"FORMAT: {format_type.upper()}")
             print(f"{'='*120}")
 
-            per_table_modes = [m for m in OPTIMIZATION_MODES if m["per_table"]]
+            per_table_modes = PER_TABLE_MODES
+
+            tables_present = {table for _, table in self._throughput_index}
 
             for table_name, row_count in TABLES_SF10:
+                if table_name not in tables_present:
+                    continue  # e.g. excluded via --skip-small
+
                 print(f"\n{table_name.upper()} (SF=10: {row_count:,} rows)")
                 print("-" * 120)
-                print(f"{'Mode':<30} {'Run 1 (r/s)':<18} {'Run 2 (r/s)':<18} {'Avg (r/s)':<18} {'Std Dev':<12} {'Speedup':<10}")
+                ipc_header = f" {'IPC':<8}" if self._ipc else ""
+                print(f"{'Mode':<30} {'Run 1 (r/s)':<18} {'Run 2 (r/s)':<18} {center_label:<18} {spread_label:<12} {'Speedup':<10}{ipc_header}")
                 print("-" * 120)
 
                 baseline_avg = None
 
                 for mode in per_table_modes:
                     result_key = f"{format_type}_{mode['name']}"
-                    mode_results = [
-                        r for r in self.results.get(result_key, [])
-                        if r.get("table") == table_name
-                    ]
+                    throughputs = self._throughput_index.get((result_key, table_name))
 
-                    if not mode_results:
+                    if not throughputs:
                         continue
 
-                    throughputs = [r["throughput"] for r in mode_results]
-
-                    if len(throughputs) >= 2:
-                        avg_throughput = mean(throughputs)
-                        std_dev = stdev(throughputs)
-                        run1 = throughputs[0]
-                        run2 = throughputs[1]
-                    else:
-                        avg_throughput = throughputs[0] if throughputs else 0
-                        std_dev = 0
-                        run1 = throughputs[0] if throughputs else 0
-                        run2 = 0
+                    avg_throughput, std_dev = self._stats[(result_key, table_name)]
+                    run1 = throughputs[0]
+                    run2 = throughputs[1] if len(throughputs) >= 2 else 0
 
                     if mode["name"] == "baseline":
                         baseline_avg = avg_throughput
@@ -362,11 +977,20 @@ class Phase15Benchmark:
 
                     speedup_str = f"{speedup:.2f}x" if speedup > 0 else "N/A"
 
-                    print(f"{mode['name']:<30} {run1:>16,.0f} {run2:>16,.0f} {avg_throughput:>16,.0f} {std_dev:>10,.0f} {speedup_str:>9}")
+                    # Flag noisy measurements: spread over 5% of center
+                    # means the speedup column is not trustworthy.
+                    noisy = " ⚠" if avg_throughput > 0 and std_dev / avg_throughput > 0.05 else ""
+
+                    ipc_col = ""
+                    if self._ipc:
+                        ipc = self._ipc.get((result_key, table_name))
+                        ipc_col = f" {ipc:>6.2f}" if ipc else f" {'-':>6}"
+
+                    print(f"{mode['name']:<30} {run1:>16,.0f} {run2:>16,.0f} {avg_throughput:>16,.0f} {std_dev:>10,.0f} {speedup_str:>9}{noisy}{ipc_col}")
 
         # Parallel analysis by format
         for format_type in FORMATS:
-            parallel_modes = [m for m in OPTIMIZATION_MODES if m["parallel"]]
+            parallel_modes = PARALLEL_MODES
             parallel_result_keys = [f"{format_type}_{m['name']}" for m in parallel_modes]
             has_parallel = any(k in self.results for k in parallel_result_keys)
 
@@ -374,7 +998,7 @@ class Phase15Benchmark:
                 print(f"\n\n" + "="*120)
                 print(f"PARALLEL MODE ANALYSIS - {format_type.upper()} (All 8 Tables Combined)")
                 print("="*120)
-                total_rows = sum(count for _, count in TABLES_SF10)
+                total_rows = TOTAL_ROWS_SF10
                 print(f"Total SF=10 rows: {total_rows:,}")
                 print(f"\n{'Mode':<35} {'Run 1 (s)':<15} {'Run 2 (s)':<15} {'Avg (s)':<15} {'Std Dev':<12} {'Speedup':<10} {'Rows/sec':<15}")
                 print("-" * 130)
@@ -393,11 +1017,11 @@ class Phase15Benchmark:
                     throughputs = [r.get("throughput", 0) for r in results]
 
                     if len(elapsed_times) >= 2:
-                        avg_elapsed = mean(elapsed_times)
+                        avg_elapsed = fmean(elapsed_times)
                         std_dev = stdev(elapsed_times)
                         run1 = elapsed_times[0]
                         run2 = elapsed_times[1]
-                        avg_throughput = mean(throughputs) if throughputs else 0
+                        avg_throughput = fmean(throughputs) if throughputs else 0
                     else:
                         avg_elapsed = elapsed_times[0] if elapsed_times else 0
                         std_dev = 0
@@ -421,8 +1045,8 @@ class Phase15Benchmark:
 
         # Async-IO specific analysis per format
         for format_type in FORMATS:
-            async_modes = [m for m in OPTIMIZATION_MODES if "async" in m["name"]]
-            parallel_modes = [m for m in OPTIMIZATION_MODES if m["parallel"]]
+            async_modes = ASYNC_MODES
+            parallel_modes = PARALLEL_MODES
 
             async_result_keys = [f"{format_type}_{m['name']}" for m in async_modes]
             parallel_result_keys = [f"{format_type}_{m['name']}" for m in parallel_modes]
@@ -441,14 +1065,10 @@ class Phase15Benchmark:
                 ]
 
                 for baseline_name, async_name, description in async_comparisons:
-                    baseline_key = f"{format_type}_{baseline_name}"
-                    async_key = f"{format_type}_{async_name}"
-                    baseline_results = self.results.get(baseline_key, [])
-                    async_results = self.results.get(async_key, [])
-
-                    if baseline_results and async_results:
-                        baseline_avg = mean([r["elapsed"] for r in baseline_results])
-                        async_avg = mean([r["elapsed"] for r in async_results])
+                    baseline_avg = self._elapsed_mean.get(f"{format_type}_{baseline_name}")
+                    async_avg = self._elapsed_mean.get(f"{format_type}_{async_name}")
+
+                    if baseline_avg and async_avg:
                         improvement = ((baseline_avg - async_avg) / baseline_avg) * 100 if baseline_avg > 0 else 0
                         speedup = baseline_avg / async_avg if async_avg > 0 else 0
 
@@ -458,34 +1078,47 @@ class Phase15Benchmark:
         # Per-table optimization impact by format
         for format_type in FORMATS:
             print(f"\nPer-Table Optimization Impact - {format_type.upper()}:")
-            per_table_modes = [m for m in OPTIMIZATION_MODES if m["per_table"]]
-            for mode in per_table_modes:
+            # Baseline centers for this format, resolved once instead of
+            # per (mode, table) pair.
+            baseline_key = f"{format_type}_baseline"
+            baseline_center = {
+                table_name: stats[0]
+                for table_name, _ in TABLES_SF10
+                if (stats := self._stats.get((baseline_key, table_name)))
+                and stats[0] > 0
+            }
+            for mode in PER_TABLE_MODES:
                 if mode["name"] != "baseline":
                     result_key = f"{format_type}_{mode['name']}"
-                    mode_results = self.results.get(result_key, [])
-                    if mode_results:
+                    if self.results.get(result_key):
                         # Calculate average speedup across all tables
                         speedups = []
-                        for table_name, row_count in TABLES_SF10:
-                            table_results = [r for r in mode_results if r.get("table") == table_name]
-                            if table_results:
-                                baseline_key = f"{format_type}_baseline"
-                                baseline_results = [
-                                    r for r in self.results.get(baseline_key, [])
-                                    if r.get("table") == table_name
-                                ]
-                                if baseline_results:
-                                    baseline_avg = mean([r["throughput"] for r in baseline_results])
-                                    mode_avg = mean([r["throughput"] for r in table_results])
-                                    speedup = mode_avg / baseline_avg if baseline_avg > 0 else 0
-                                    speedups.append(speedup)
+                        for table_name, center in baseline_center.items():
+                            mode_stats = self._stats.get((result_key, table_name))
+                            if mode_stats:
+                                speedups.append(mode_stats[0] / center)
 
                         if speedups:
-                            avg_speedup = mean(speedups)
+                            avg_speedup = fmean(speedups)
                             min_speedup = min(speedups)
                             max_speedup = max(speedups)
                             print(f"  {mode['name']:<30} Avg: {avg_speedup:6.2f}x  (range: {min_speedup:.2f}x - {max_speedup:.2f}x)")
 
+        # Surface runs whose parquet output did not hold the expected
+        # row count: their throughput numbers cannot be trusted.
+        mismatches = [
+            (result_key, r.get("table"), r.get("run"))
+            for result_key, results in self.results.items()
+            for r in results
+            if r.get("verified") is False
+        ]
+        if mismatches:
+            print(f"\n\n" + "="*120)
+            print("⚠️  OUTPUT VERIFICATION FAILURES (parquet row count mismatch)")
+            print("="*120)
+            for result_key, table, run in mismatches:
+                print(f"  {result_key:<40} table={table} run={run}")
+
     def save_results(self):
         """Save results to JSON"""
         output_file = self.output_dir / "phase16_sf10_results.json"
@@ -495,37 +1128,112 @@ class Phase15Benchmark:
             "binary": str(self.tpch_binary),
             "scale_factor": 10,
             "tables": len(TABLES_SF10),
-            "total_rows": sum(count for _, count in TABLES_SF10),
+            "total_rows": TOTAL_ROWS_SF10,
             "runs_per_benchmark": self.runs,
             "optimization_modes": len(OPTIMIZATION_MODES),
             "results": self.results
         }
 
+        # Compact form: results.jsonl already serves as the incremental,
+        # human-greppable record, and raw stdout never enters these
+        # dicts (it streams to the per-run stdout.log), so this file
+        # only needs to be cheap to write and machine-readable.
         with open(output_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+            json.dump(summary, f, indent=None, separators=(",", ":"))
 
         print(f"\n✅ Results saved to: {output_file}")
 
+        # Flat CSV mirrors of the nested JSON so downstream pandas /
+        # pivot-table analysis needs no re-flattening. results.csv has
+        # one row per run with every scalar field; results_summary.csv
+        # carries the cached per-(mode, table) statistics.
+        csv_file = self.output_dir / "results.csv"
+        fieldnames: List[str] = ["result_key"]
+        rows = []
+        for result_key, results in self.results.items():
+            for r in results:
+                row = {"result_key": result_key}
+                for field, value in r.items():
+                    if isinstance(value, (dict, list)):
+                        continue  # nested data (perf counters) stays in JSON
+                    row[field] = value
+                    if field not in fieldnames:
+                        fieldnames.append(field)
+                rows.append(row)
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"✅ Per-run CSV saved to: {csv_file}")
+
+        if not hasattr(self, "_stats"):
+            self._index_results()
+        summary_file = self.output_dir / "results_summary.csv"
+        center_name = "median" if self._robust_stats else "mean"
+        spread_name = "mad" if self._robust_stats else "stdev"
+        with open(summary_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["result_key", "table", center_name, spread_name,
+                             "speedup_vs_baseline"])
+            for (result_key, table), (center, spread) in self._stats.items():
+                format_type = result_key.split("_", 1)[0]
+                baseline = self._stats.get((f"{format_type}_baseline", table))
+                speedup = center / baseline[0] if baseline and baseline[0] > 0 else ""
+                writer.writerow([result_key, table, center, spread, speedup])
+        print(f"✅ Summary CSV saved to: {summary_file}")
+
 
 def main():
+    import argparse
     import sys
 
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <path/to/tpch_benchmark> [output_dir] [runs]")
-        print(f"Example: {sys.argv[0]} ./build/tpch_benchmark /tmp/phase16 2")
-        print(f"\nDefault: 2 runs per benchmark combination")
-        sys.exit(1)
-
-    tpch_binary = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "/tmp/phase16_sf10_benchmark"
-    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    parser = argparse.ArgumentParser(description="Phase 16: Full Optimization Matrix Benchmark at SF=10")
+    parser.add_argument("tpch_binary", help="Path to tpch_benchmark executable")
+    parser.add_argument("output_dir", nargs="?", default="/tmp/phase16_sf10_benchmark",
+                        help="Benchmark output directory")
+    parser.add_argument("runs", nargs="?", type=int, default=2,
+                        help="Runs per benchmark combination (default: 2)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Concurrent invocations for per-table modes (default: 1)")
+    parser.add_argument("--warmup", action="store_true",
+                        help="Run each combination once extra up front and discard it")
+    parser.add_argument("--interleave", action="store_true",
+                        help="Shuffle (table, run) order within each mode (fixed seed)")
+    parser.add_argument("--cold-cache", action="store_true",
+                        help="Drop the Linux page cache before every run (needs root/sudo)")
+    parser.add_argument("--cpus", default=None, metavar="LIST",
+                        help="Pin the binary to these CPUs via taskset, e.g. 0-7")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Run the binary under SCHED_FIFO via chrt -f 50 (needs root)")
+    parser.add_argument("--skip-small", action="store_true",
+                        help="Exclude nation/region from per-table modes (launch "
+                             "overhead dominates their measured time)")
+    parser.add_argument("--perf", action="store_true",
+                        help="Wrap each run in perf stat and record counters/IPC")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Skip runs whose parquet output already holds the "
+                             "expected row count (needs pyarrow)")
+    parser.add_argument("--abort-on-failure", action="store_true",
+                        help="Stop the whole suite as soon as any run fails")
+    parser.add_argument("--generate-once", action="store_true",
+                        help="Run dbgen once into a shared dir and rewrite from "
+                             "it per mode (needs --phase support in the binary)")
+    args = parser.parse_args()
 
     # Verify binary exists
-    if not Path(tpch_binary).exists():
-        print(f"Error: Binary not found: {tpch_binary}")
+    if not Path(args.tpch_binary).exists():
+        print(f"Error: Binary not found: {args.tpch_binary}")
         sys.exit(1)
 
-    benchmark = Phase15Benchmark(tpch_binary, output_dir, runs)
+    benchmark = Phase15Benchmark(args.tpch_binary, args.output_dir, args.runs,
+                                 jobs=args.jobs, warmup=args.warmup,
+                                 interleave=args.interleave,
+                                 cold_cache=args.cold_cache,
+                                 cpus=args.cpus, realtime=args.realtime,
+                                 skip_small=args.skip_small, perf=args.perf,
+                                 skip_existing=args.skip_existing,
+                                 abort_on_failure=args.abort_on_failure,
+                                 generate_once=args.generate_once)
 
     # Run all benchmarks
     benchmark.run_all_benchmarks()
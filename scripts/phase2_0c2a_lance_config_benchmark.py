@@ -10,6 +10,8 @@ Tests different Lance WriteParams configurations:
 Measures impact on write throughput and compression ratio.
 """
 
+import os
+import shutil
 import subprocess
 import sys
 import time
@@ -28,13 +30,24 @@ LANCE_CONFIGS = {
 }
 
 def get_file_size(path: Path) -> int:
-    """Get total size of Lance dataset directory."""
+    """Get total size of Lance dataset directory.
+
+    Walks with os.scandir rather than Path.rglob: DirEntry caches the
+    type and stat from the directory read, so sizing a multi-thousand
+    file Lance dataset costs one getdents pass instead of two syscalls
+    per entry plus a Path object each.
+    """
     if not path.exists():
         return 0
     total = 0
-    for f in path.rglob("*"):
-        if f.is_file():
-            total += f.stat().st_size
+    stack = [str(path)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
     return total
 
 
@@ -46,7 +59,7 @@ def run_benchmark(binary_path: Path, config_name: str) -> Tuple[float, int]:
     dataset_path = Path("/tmp/lineitem.lance")
 
     # Clean up previous run
-    subprocess.run(f"rm -rf {dataset_path}", shell=True, capture_output=True)
+    shutil.rmtree(dataset_path, ignore_errors=True)
 
     print(f"Running benchmark with {LANCE_CONFIGS[config_name]}...")
     start_time = time.time()
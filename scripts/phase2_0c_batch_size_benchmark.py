@@ -5,7 +5,9 @@ Phase 2.0c-1: Batch Size Sensitivity Testing
 Tests different batch sizes (5K, 10K, 20K, 50K) to find optimal value for Lance encoding.
 Measures throughput (rows/sec) for lineitem table (6M rows, SF=1).
 
-Uses existing build/lance_test directory for incremental builds only.
+Each batch size gets its own build directory (build/lance_test_bs{N})
+configured with -DTPCH_BATCH_SIZE=<n>, so the four variants build in
+parallel and no source file is ever patched.
 
 Expected behavior:
   - 5K batch: High encoding overhead, more batches (1200+), ~500K rows/sec
@@ -14,16 +16,20 @@ Expected behavior:
   - 50K batch: Very low encoding overhead, 120 batches, ~600-610K rows/sec
 """
 
+import shutil
+import signal
 import subprocess
 import sys
+import tempfile
 import time
-import re
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from statistics import median, quantiles
+from typing import Dict, Optional, Tuple
 
 PROJECT_ROOT = Path("/home/tsafin/src/tpch-cpp")
-BUILD_DIR = PROJECT_ROOT / "build" / "lance_test"  # Reuse existing build directory!
 RESULTS_FILE = PROJECT_ROOT / "PHASE_2_0C_BATCH_SIZE_RESULTS.txt"
 BATCH_SIZES = [5000, 10000, 20000, 50000]
 
@@ -31,116 +37,195 @@ BATCH_SIZES = [5000, 10000, 20000, 50000]
 LINEITEM_ROWS = 6_001_215  # TPC-H SF=1
 LINEITEM_COLUMNS = 16
 
-def modify_batch_size(batch_size: int) -> None:
-    """Modify batch size in source code (all occurrences for all tables)."""
-    main_cpp = PROJECT_ROOT / "src" / "main.cpp"
-    content = main_cpp.read_text()
+# A single timed run cannot separate the batch-size effect from system
+# noise: each batch size gets N_WARMUP discarded cache-priming runs plus
+# N_MEASURE measured ones, and the median is reported with the IQR as
+# the spread.
+N_WARMUP = 1
+N_MEASURE = 3
 
-    # Replace ALL batch size constants (there's one per table)
-    pattern = r"const size_t batch_size = \d+;"
-    replacement = f"const size_t batch_size = {batch_size};"
-    new_content = re.sub(pattern, replacement, content)  # Replaces ALL occurrences
+# Pin the benchmark to the first half of the CPUs (the physical cores
+# on typical SMT topologies) so scheduler migrations do not add noise
+# to the batch-size comparison. Skipped when taskset is unavailable.
+N_BENCH_CPUS = max(1, (os.cpu_count() or 2) // 2)
+_TASKSET = (["taskset", "-c", f"0-{N_BENCH_CPUS - 1}"]
+            if shutil.which("taskset") else [])
 
-    if new_content == content:
-        print(f"WARNING: Could not find batch_size constant in {main_cpp}")
-        return
+def build_dir_for(batch_size: int) -> Path:
+    """Build directory for one batch-size variant of the binary."""
+    return PROJECT_ROOT / "build" / f"lance_test_bs{batch_size}"
 
-    # Count replacements to verify
-    num_replacements = len(re.findall(pattern, content))
 
-    main_cpp.write_text(new_content)
-    print(f"✓ Modified {num_replacements} batch size constants to: {batch_size}")
+def configure_and_build(batch_size: int, jobs: int) -> Optional[Path]:
+    """Configure (once) and build the binary for one batch size.
 
+    Each variant lives in its own build directory with the batch size
+    baked in via the TPCH_BATCH_SIZE cmake cache variable, so the
+    compiler can constant-fold it into the write loops and no source
+    file is ever patched. Returns the binary path, or None on failure.
+    """
+    build_dir = build_dir_for(batch_size)
+
+    if not (build_dir / "CMakeCache.txt").exists():
+        # Ninja's incremental and null builds are far faster than
+        # make's, which matters for a sweep of four build trees.
+        generator = ["-G", "Ninja"] if shutil.which("ninja") else []
+        result = subprocess.run(
+            ["cmake", *generator,
+             "-S", str(PROJECT_ROOT), "-B", str(build_dir),
+             "-DCMAKE_BUILD_TYPE=RelWithDebInfo",
+             "-DTPCH_ENABLE_LANCE=ON",
+             f"-DTPCH_BATCH_SIZE={batch_size}"],
+            capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Configure failed for batch size {batch_size}:\n{result.stderr}")
+            return None
 
-def verify_batch_size(batch_size: int) -> bool:
-    """Verify batch size was modified correctly."""
-    main_cpp = PROJECT_ROOT / "src" / "main.cpp"
-    content = main_cpp.read_text()
-    match = re.search(r"const size_t batch_size = (\d+);", content)
+    result = subprocess.run(
+        ["cmake", "--build", str(build_dir), "-j", str(jobs)],
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Build failed for batch size {batch_size}:\n{result.stderr}")
+        return None
 
-    if not match:
-        print("ERROR: Could not find batch size constant")
-        return False
+    binary = build_dir / "tpch_benchmark"
+    if not binary.exists():
+        print(f"ERROR: Binary not found at {binary}")
+        return None
 
-    actual = int(match.group(1))
-    if actual != batch_size:
-        print(f"ERROR: Batch size mismatch. Expected {batch_size}, got {actual}")
-        return False
+    return binary
 
-    return True
 
+# Shared dbgen output, generated once and rewritten per batch size
+# instead of re-running dbgen inside every benchmark invocation.
+SHARED_INPUT_DIR = Path("/tmp/tpch_sf1")
+_shared_input = None
+_help_text = None
 
-def rebuild_project_incremental() -> bool:
-    """Rebuild project incrementally (C++ only, no Lance rebuild)."""
-    print("Building project (incremental C++ only)...")
 
-    # Verify build directory exists and has CMakeCache
-    if not (BUILD_DIR / "CMakeCache.txt").exists():
-        print(f"ERROR: Build directory not configured. Run initial cmake setup first.")
-        return False
+def _binary_supports(binary: Path, flag: str) -> bool:
+    """Probe the binary's --help once to see whether a flag exists."""
+    global _help_text
+    if _help_text is None:
+        try:
+            probe = subprocess.run([str(binary), "--help"],
+                                   capture_output=True, timeout=10)
+            _help_text = (probe.stdout + probe.stderr).decode(errors="replace")
+        except (OSError, subprocess.TimeoutExpired):
+            _help_text = ""
+    return flag in _help_text
+
+
+def prepare_shared_input(binary: Path) -> bool:
+    """Run dbgen for lineitem once; reuse the .tbl if already present."""
+    global _shared_input
+    if not SHARED_INPUT_DIR.exists() or not any(SHARED_INPUT_DIR.glob("lineitem*")):
+        SHARED_INPUT_DIR.mkdir(parents=True, exist_ok=True)
+        print("Generating shared lineitem dbgen data (one-time)...")
+        result = subprocess.run(
+            [str(binary), "--use-dbgen", "--table", "lineitem",
+             "--scale-factor", "1", "--max-rows", "0",
+             "--phase", "generate", "--output-dir", str(SHARED_INPUT_DIR)],
+            capture_output=True, timeout=600)
+        if result.returncode != 0:
+            print("WARNING: shared generation failed; running dbgen per invocation")
+            return False
+    _shared_input = SHARED_INPUT_DIR
+    return True
 
-    # Incremental build - only rebuild changed C++ files
-    result = subprocess.run(
-        ["cmake", "--build", ".", "-j", str(os.cpu_count() or 4)],
-        cwd=BUILD_DIR,
-        capture_output=True,
-        text=True
-    )
 
-    if result.returncode != 0:
-        print(f"Build failed:\n{result.stderr}")
-        return False
+def _run_once(binary_path: Path) -> Tuple[float, bool]:
+    """Run the lineitem benchmark once; return (elapsed, succeeded)."""
+    # Clean up previous runs in-process instead of forking a shell for
+    # rm -rf; the parquet writer may leave a file rather than a dir.
+    for path in [Path("/tmp/lineitem.lance"), Path("/tmp/lineitem.parquet")]:
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+    # stdout (progress logs, many MB for lineitem) is never read, so
+    # discard it outright; stderr goes to an unnamed temp file that is
+    # only read back when the run fails.
+    with tempfile.TemporaryFile() as err_f:
+        start_time = time.perf_counter()
+
+        cmd = [*_TASKSET,
+               str(binary_path),
+               "--use-dbgen",
+               "--format", "lance",
+               "--table", "lineitem",
+               "--scale-factor", "1",
+               "--max-rows", "0"]
+        # Rewrite from the shared dbgen data instead of regenerating it.
+        if _shared_input is not None:
+            cmd += ["--phase", "rewrite", "--input-dir", str(_shared_input)]
+
+        # Own session so a timeout can SIGKILL the whole process group:
+        # killing just the child would leave its dbgen helpers running
+        # and polluting the next batch-size measurement.
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=err_f,
+                                start_new_session=True)
+        try:
+            proc.wait(timeout=120)  # 2 minute timeout
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                proc.kill()
+            proc.wait()
+            raise
 
-    binary = BUILD_DIR / "tpch_benchmark"
-    if not binary.exists():
-        print(f"ERROR: Binary not found at {binary}")
-        return False
+        elapsed = time.perf_counter() - start_time
 
-    print("✓ Incremental build complete")
-    return True
+        if proc.returncode != 0:
+            err_f.seek(0)
+            print(f"Benchmark failed:\n{err_f.read().decode(errors='replace')}")
+            return elapsed, False
+
+    return elapsed, True
 
 
 def run_benchmark(binary_path: Path, batch_size: int) -> Tuple[float, float]:
     """
     Run lineitem benchmark and return (elapsed_time, throughput).
 
+    Runs N_WARMUP + N_MEASURE times; the warm-ups are discarded and the
+    returned elapsed time is the median of the measured runs.
+
     Returns:
         Tuple of (elapsed_seconds, rows_per_second)
     """
-    # Clean up previous runs
-    for path in ["/tmp/lineitem.lance", "/tmp/lineitem.parquet"]:
-        subprocess.run(f"rm -rf {path}", shell=True, capture_output=True)
-
-    print(f"Running benchmark with batch size {batch_size}...")
+    print(f"Running benchmark with batch size {batch_size} "
+          f"({N_WARMUP} warm-up + {N_MEASURE} measured runs)...")
 
-    start_time = time.time()
+    samples = []
+    ok = True
+    for i in range(N_WARMUP + N_MEASURE):
+        elapsed, succeeded = _run_once(binary_path)
+        if i < N_WARMUP:
+            continue
+        samples.append(elapsed)
+        ok &= succeeded
 
-    result = subprocess.run(
-        [str(binary_path),
-         "--use-dbgen",
-         "--format", "lance",
-         "--table", "lineitem",
-         "--scale-factor", "1",
-         "--max-rows", "0"],
-        capture_output=True,
-        text=True,
-        timeout=120  # 2 minute timeout
-    )
-
-    elapsed = time.time() - start_time
-
-    if result.returncode != 0:
-        print(f"Benchmark failed:\n{result.stderr}")
-        return elapsed, 0.0
+    center = median(samples)
+    if len(samples) >= 2:
+        q = quantiles(samples, n=4)
+        print(f"  median {center:.2f}s, IQR {q[2] - q[0]:.2f}s "
+              f"over {len(samples)} runs")
 
-    # Calculate throughput (rows/sec)
-    throughput = LINEITEM_ROWS / elapsed if elapsed > 0 else 0
-
-    return elapsed, throughput
+    throughput = LINEITEM_ROWS / center if ok and center > 0 else 0.0
+    return center, throughput
 
 
+@lru_cache(maxsize=None)
 def calculate_batch_metrics(batch_size: int, elapsed: float) -> Dict[str, float]:
-    """Calculate metrics for batch size test."""
+    """Calculate metrics for batch size test.
+
+    Pure function of its arguments, called once for the live print and
+    again for the report table — memoized so both read the same dict
+    (callers only read it, never mutate).
+    """
     batch_count = LINEITEM_ROWS // batch_size
 
     # Encoding overhead estimate based on Phase 2.0b profiling
@@ -160,21 +245,59 @@ def calculate_batch_metrics(batch_size: int, elapsed: float) -> Dict[str, float]
     }
 
 
-def format_results_markdown(results: Dict[int, Tuple[float, float]]) -> str:
-    """Format results as Markdown table."""
-    lines = [
-        "# Phase 2.0c-1: Batch Size Sensitivity Analysis",
-        "",
-        "**Date**: February 7, 2026  ",
-        "**Table**: lineitem (SF=1, 6,001,215 rows, 16 columns)  ",
-        "**Format**: Lance  ",
-        "**Test**: Vary batch size and measure throughput impact",
-        "",
-        "## Results Summary",
-        "",
-        "| Batch Size | Batches | Time (sec) | Rows/sec | vs 10K | Encoding Est | Memory (MB) |",
-        "|-----------|---------|-----------|----------|--------|--------------|-------------|",
-    ]
+# Static report sections as module-level templates so the assembly code
+# only fills in computed numbers instead of appending boilerplate lines.
+_REPORT_HEADER = """\
+# Phase 2.0c-1: Batch Size Sensitivity Analysis
+
+**Date**: February 7, 2026
+**Table**: lineitem (SF=1, 6,001,215 rows, 16 columns)
+**Format**: Lance
+**Test**: Vary batch size and measure throughput impact
+
+## Results Summary
+
+| Batch Size | Batches | Time (sec) | Rows/sec | vs 10K | Encoding Est | Memory (MB) |
+|-----------|---------|-----------|----------|--------|--------------|-------------|"""
+
+# Summary-table row as a str.format template: the format specs are
+# parsed once instead of on every loop iteration, and the row layout
+# lives in one place next to the header it must line up with.
+_ROW_TMPL = "| {batch_size:,} | {batch_count:,} | {elapsed:7.2f} | {throughput:>10,.0f} | {improvement:>6} | {encoding_pct:.1f}% | {memory_mb:>10.1f} |"
+
+_REPORT_FOOTER = """\
+- Larger batches reduce encoding overhead by processing fewer batch boundaries
+- Smaller batches increase encoding calls (XXH3, HyperLogLog, strategy selection)
+- Sweet spot depends on balance between encoding efficiency and memory pressure
+
+## Recommendations
+
+1. If throughput improves with larger batch size:
+   - Consider increasing to optimal batch size for production use
+   - Verify memory usage remains acceptable
+
+2. If 10K is already optimal:
+   - Focus on Phase 2.0c-2 (statistics caching optimization)
+   - Current batch size is well-tuned for encoding efficiency
+
+## Next Steps
+
+- **Phase 2.0c-2**: Implement statistics caching (target: +2-5% speedup)
+- **Phase 2.0c-3**: Encoding strategy simplification (target: +3-8% speedup)
+- **Phase 2.0c-4**: Async runtime tuning (target: +2-4% speedup)
+- **Expected cumulative**: 12-27% speedup, target 630K+ rows/sec for lineitem"""
+
+
+def iter_report_lines(results: Dict[int, Tuple[float, float]],
+                      failures: Dict[int, str] = None):
+    """Yield the Markdown report section by section.
+
+    A generator instead of one big joined string: main() streams each
+    chunk straight to the results file, so the report is never held in
+    memory twice. Failed batch sizes appear in their own section
+    rather than aborting the report.
+    """
+    yield _REPORT_HEADER
 
     # Get baseline (10K batch)
     baseline_throughput = results.get(10000, (0, 0))[1]
@@ -186,51 +309,36 @@ def format_results_markdown(results: Dict[int, Tuple[float, float]]) -> str:
         improvement = ((throughput - baseline_throughput) / baseline_throughput * 100) if baseline_throughput > 0 else 0
         improvement_str = f"{improvement:+.1f}%" if batch_size != 10000 else "baseline"
 
-        line = f"| {batch_size:,} | {metrics['batch_count']:,} | {elapsed:7.2f} | {throughput:>10,.0f} | {improvement_str:>6} | {metrics['encoding_pct']:.1f}% | {metrics['memory_estimate_mb']:>10.1f} |"
-        lines.append(line)
-
-    lines.extend([
-        "",
-        "## Analysis",
-        "",
-        "**Key Findings**:",
-        "",
-    ])
-
-    # Add analysis based on results
-    best_batch = max(results.items(), key=lambda x: x[1][1])
-    baseline = results.get(10000, (0, 0))
-
-    if best_batch[0] != 10000:
-        improvement_pct = ((best_batch[1][1] - baseline[1]) / baseline[1] * 100)
-        lines.append(f"- **Optimal batch size**: {best_batch[0]:,} (throughput: {best_batch[1][1]:,.0f} rows/sec, {improvement_pct:+.1f}% vs 10K baseline)")
-    else:
-        lines.append(f"- **Baseline optimal**: 10K batch size remains best performer")
-
-    lines.extend([
-        "- Larger batches reduce encoding overhead by processing fewer batch boundaries",
-        "- Smaller batches increase encoding calls (XXH3, HyperLogLog, strategy selection)",
-        "- Sweet spot depends on balance between encoding efficiency and memory pressure",
-        "",
-        "## Recommendations",
-        "",
-        "1. If throughput improves with larger batch size:",
-        "   - Consider increasing to optimal batch size for production use",
-        "   - Verify memory usage remains acceptable",
-        "",
-        "2. If 10K is already optimal:",
-        "   - Focus on Phase 2.0c-2 (statistics caching optimization)",
-        "   - Current batch size is well-tuned for encoding efficiency",
-        "",
-        "## Next Steps",
-        "",
-        "- **Phase 2.0c-2**: Implement statistics caching (target: +2-5% speedup)",
-        "- **Phase 2.0c-3**: Encoding strategy simplification (target: +3-8% speedup)",
-        "- **Phase 2.0c-4**: Async runtime tuning (target: +2-4% speedup)",
-        "- **Expected cumulative**: 12-27% speedup, target 630K+ rows/sec for lineitem",
-    ])
-
-    return "\n".join(lines)
+        yield _ROW_TMPL.format(batch_size=batch_size,
+                               batch_count=metrics["batch_count"],
+                               elapsed=elapsed, throughput=throughput,
+                               improvement=improvement_str,
+                               encoding_pct=metrics["encoding_pct"],
+                               memory_mb=metrics["memory_estimate_mb"])
+
+    # Add analysis based on results; the 10K baseline may itself have
+    # failed, in which case the relative numbers are simply omitted.
+    if results:
+        best_batch = max(results.items(), key=lambda x: x[1][1])
+        baseline = results.get(10000, (0, 0))
+
+        if best_batch[0] == 10000:
+            finding = "- **Baseline optimal**: 10K batch size remains best performer"
+        elif baseline[1] > 0:
+            improvement_pct = ((best_batch[1][1] - baseline[1]) / baseline[1] * 100)
+            finding = f"- **Optimal batch size**: {best_batch[0]:,} (throughput: {best_batch[1][1]:,.0f} rows/sec, {improvement_pct:+.1f}% vs 10K baseline)"
+        else:
+            finding = f"- **Optimal batch size**: {best_batch[0]:,} (throughput: {best_batch[1][1]:,.0f} rows/sec; no 10K baseline available)"
+
+        yield f"\n## Analysis\n\n**Key Findings**:\n\n{finding}"
+
+    if failures:
+        rows = "\n".join(
+            f"- **{batch_size:,}**: {reason}"
+            for batch_size, reason in sorted(failures.items()))
+        yield f"\n## Failed Batch Sizes\n\n{rows}"
+
+    yield _REPORT_FOOTER
 
 
 def main():
@@ -240,42 +348,63 @@ def main():
     print("=" * 60)
     print()
     print(f"Project root: {PROJECT_ROOT}")
-    print(f"Build directory: {BUILD_DIR} (reusing existing, incremental builds)")
+    print(f"Build directories: build/lance_test_bs{{N}} (one per batch size)")
     print(f"Results file: {RESULTS_FILE}")
     print(f"Batch sizes to test: {BATCH_SIZES}")
     print()
 
-    # Verify build directory exists
-    if not BUILD_DIR.exists():
-        print(f"ERROR: Build directory not found: {BUILD_DIR}")
-        print("Please run: mkdir -p build/lance_test && cd build/lance_test && cmake -DCMAKE_BUILD_TYPE=RelWithDebInfo -DTPCH_ENABLE_LANCE=ON ../..")
+    if not (PROJECT_ROOT / "CMakeLists.txt").exists():
+        print(f"ERROR: Project root not found: {PROJECT_ROOT}")
         sys.exit(1)
 
-    # Store results
+    # Build all variants concurrently: the four build trees are fully
+    # independent, so the sweep pays one build's wall time instead of
+    # four. Each build gets an even share of the -j parallelism.
+    print("Building all batch-size variants...")
+    jobs = max(1, (os.cpu_count() or 4) // len(BATCH_SIZES))
+    binaries: Dict[int, Path] = {}
+    failures: Dict[int, str] = {}
+
+    with ThreadPoolExecutor(max_workers=len(BATCH_SIZES)) as executor:
+        futures = {
+            executor.submit(configure_and_build, batch_size, jobs): batch_size
+            for batch_size in BATCH_SIZES
+        }
+        for future in as_completed(futures):
+            batch_size = futures[future]
+            binary = future.result()
+            if binary is None:
+                failures[batch_size] = "build failed"
+            else:
+                binaries[batch_size] = binary
+                print(f"✓ Built batch size {batch_size:,}")
+
+    # Generate lineitem's .tbl once up-front when the binary supports
+    # the generate/rewrite phase split: the sweep otherwise pays the
+    # same dbgen cost four times over.
+    if binaries:
+        probe_binary = next(iter(binaries.values()))
+        if _binary_supports(probe_binary, "--phase"):
+            prepare_shared_input(probe_binary)
+        else:
+            print("Note: binary lacks --phase support; dbgen runs per invocation")
+
+    # Benchmarks stay sequential on purpose: concurrent runs would
+    # contend for the pinned CPUs and disk bandwidth, polluting exactly
+    # the comparison this sweep exists to make. A failed batch size is
+    # recorded and skipped rather than aborting the sweep.
     results: Dict[int, Tuple[float, float]] = {}
 
-    # Run tests for each batch size
     for batch_size in BATCH_SIZES:
+        if batch_size not in binaries:
+            continue
+
         print(f"\n{'='*60}")
         print(f"Testing Batch Size: {batch_size:,}")
         print(f"{'='*60}")
 
-        # Modify source code
-        modify_batch_size(batch_size)
-
-        # Verify modification
-        if not verify_batch_size(batch_size):
-            print(f"ERROR: Batch size verification failed")
-            sys.exit(1)
-
-        # Rebuild incrementally
-        if not rebuild_project_incremental():
-            print(f"ERROR: Incremental build failed")
-            sys.exit(1)
-
-        # Run benchmark
         try:
-            elapsed, throughput = run_benchmark(BUILD_DIR / "tpch_benchmark", batch_size)
+            elapsed, throughput = run_benchmark(binaries[batch_size], batch_size)
             results[batch_size] = (elapsed, throughput)
 
             metrics = calculate_batch_metrics(batch_size, elapsed)
@@ -289,20 +418,17 @@ def main():
 
         except subprocess.TimeoutExpired:
             print(f"ERROR: Benchmark timed out for batch size {batch_size}")
-            sys.exit(1)
+            failures[batch_size] = "timeout"
         except Exception as e:
             print(f"ERROR: {e}")
             import traceback
             traceback.print_exc()
-            sys.exit(1)
-
-    # Restore original batch size
-    print(f"\nRestoring original batch size (10000)...")
-    modify_batch_size(10000)
+            failures[batch_size] = str(e)
 
     # Write results
     print(f"\nWriting results to {RESULTS_FILE}...")
-    RESULTS_FILE.write_text(format_results_markdown(results))
+    with RESULTS_FILE.open("w") as f:
+        f.writelines(chunk + "\n" for chunk in iter_report_lines(results, failures))
 
     # Print final report
     print()
@@ -9,10 +9,18 @@ Tests all 8 TPC-H tables (SF=1) with applied optimizations:
 Compares Lance vs Parquet performance.
 """
 
+import argparse
+import os
+import shutil
+import signal
 import subprocess
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from statistics import median, quantiles
 from typing import Dict, List, Tuple
 
 PROJECT_ROOT = Path("/home/tsafin/src/tpch-cpp")
@@ -31,35 +39,167 @@ TABLES = {
     "region": 5,
 }
 
-def run_benchmark(binary_path: Path, table: str, format: str) -> Tuple[float, float]:
+BENCH_TIMEOUT = 120  # seconds per benchmark invocation
+
+# Single-shot timing entangles benchmark variance with the signal; each
+# combination runs N_WARMUP discarded cache-priming runs plus N_MEASURE
+# measured ones, and the report uses the median with the IQR as spread.
+N_WARMUP = 1
+N_MEASURE = 3
+
+# Pin benchmark processes to the first half of the CPUs (the physical
+# cores on typical SMT topologies): letting the scheduler migrate the
+# binary across cores or NUMA nodes mid-run both slows it down and
+# inflates run-to-run variance. Skipped when taskset is unavailable.
+N_BENCH_CPUS = max(1, (os.cpu_count() or 2) // 2)
+_TASKSET = (["taskset", "-c", f"0-{N_BENCH_CPUS - 1}"]
+            if shutil.which("taskset") else [])
+
+
+# Shared dbgen output, generated once and rewritten per format instead
+# of re-running dbgen inside all 16 benchmark invocations.
+SHARED_INPUT_DIR = Path("/tmp/tpch_sf1")
+_shared_input = None
+_help_text = None
+
+
+def _binary_supports(binary: Path, flag: str) -> bool:
+    """Probe the binary's --help once to see whether a flag exists."""
+    global _help_text
+    if _help_text is None:
+        try:
+            probe = subprocess.run([str(binary), "--help"],
+                                   capture_output=True, timeout=10)
+            _help_text = (probe.stdout + probe.stderr).decode(errors="replace")
+        except (OSError, subprocess.TimeoutExpired):
+            _help_text = ""
+    return flag in _help_text
+
+
+def prepare_shared_input(binary: Path) -> bool:
+    """Run dbgen once into SHARED_INPUT_DIR; reuse it if already there."""
+    global _shared_input
+    if not SHARED_INPUT_DIR.exists() or not any(SHARED_INPUT_DIR.iterdir()):
+        SHARED_INPUT_DIR.mkdir(parents=True, exist_ok=True)
+        print("Generating shared dbgen data (one-time)...")
+        result = subprocess.run(
+            [str(binary), "--use-dbgen", "--scale-factor", "1",
+             "--max-rows", "0", "--phase", "generate",
+             "--output-dir", str(SHARED_INPUT_DIR)],
+            capture_output=True, timeout=600)
+        if result.returncode != 0:
+            print("WARNING: shared generation failed; running dbgen per invocation")
+            return False
+    _shared_input = SHARED_INPUT_DIR
+    return True
+
+
+_drop_cache_warned = False
+
+
+def drop_page_cache() -> None:
+    """Flush dirty pages and drop the kernel page cache.
+
+    Without this, whichever format runs second reads dbgen input and
+    filesystem metadata out of buffers warmed by the first, skewing the
+    Lance-vs-Parquet comparison. Writing to drop_caches needs root; a
+    passwordless sudo fallback is tried, and a warning is printed once
+    if neither works (runs then proceed warm-cache).
     """
-    Run benchmark for a table with given format.
-    Returns: (elapsed_seconds, throughput_rows_per_sec)
+    global _drop_cache_warned
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return
+    except OSError:
+        pass
+    result = subprocess.run(
+        ["sudo", "-n", "sh", "-c", "sync && echo 3 > /proc/sys/vm/drop_caches"],
+        capture_output=True)
+    if result.returncode != 0 and not _drop_cache_warned:
+        _drop_cache_warned = True
+        print("WARNING: cannot drop page cache (need root or passwordless sudo); "
+              "results reflect warm-cache performance")
+
+
+def _kill_process_group(proc) -> None:
+    """SIGKILL the benchmark's whole process group.
+
+    proc.kill() only reaches the immediate child; the dbgen helpers it
+    forks would survive and keep burning CPU under later runs. The
+    child is started in its own session so the group id is its pid.
+    """
+    try:
+        os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        proc.kill()
+
+
+def launch_benchmark(binary_path: Path, table: str, format: str):
+    """Start one benchmark invocation without waiting for it.
+
+    Returns (proc, start_time, err_f) for finalize_benchmark.
     """
     dataset_path = Path(f"/tmp/{table}.{format}")
 
-    # Clean up previous run
-    subprocess.run(f"rm -rf {dataset_path}", shell=True, capture_output=True)
+    # Clean up previous run in-process instead of forking a shell for
+    # rm -rf; the parquet writer may leave a file rather than a dir.
+    if dataset_path.is_dir():
+        shutil.rmtree(dataset_path, ignore_errors=True)
+    else:
+        dataset_path.unlink(missing_ok=True)
 
-    start_time = time.time()
+    # stdout (progress logs) is never read, so discard it outright; only
+    # stderr is kept, streamed to an unnamed temp file and read back on
+    # failure — no pipe buffering in this process either way.
+    err_f = tempfile.TemporaryFile()
 
-    result = subprocess.run(
-        [str(binary_path),
-         "--use-dbgen",
-         "--format", format,
-         "--table", table,
-         "--scale-factor", "1",
-         "--max-rows", "0"],
-        capture_output=True,
-        text=True,
-        timeout=120
-    )
+    start_time = time.perf_counter()
+
+    cmd = [*_TASKSET,
+           str(binary_path),
+           "--use-dbgen",
+           "--format", format,
+           "--table", table,
+           "--scale-factor", "1",
+           "--max-rows", "0"]
+    # Rewrite from the shared dbgen data instead of regenerating it.
+    if _shared_input is not None:
+        cmd += ["--phase", "rewrite", "--input-dir", str(_shared_input)]
 
-    elapsed = time.time() - start_time
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=err_f,
+                            start_new_session=True)
 
-    if result.returncode != 0:
-        print(f"Benchmark failed for {table} ({format}):\n{result.stderr}")
-        return elapsed, 0.0
+    return proc, start_time, err_f
+
+
+def finalize_benchmark(proc, start_time, err_f,
+                       table: str, format: str) -> Tuple[float, float]:
+    """Wait for a launched benchmark and compute its metrics.
+
+    Returns: (elapsed_seconds, throughput_rows_per_sec)
+    """
+    try:
+        # The deadline is measured from this run's own launch, not from
+        # when finalize happens to be called.
+        remaining = max(1.0, BENCH_TIMEOUT - (time.perf_counter() - start_time))
+        try:
+            proc.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            proc.wait()
+            raise
+
+        elapsed = time.perf_counter() - start_time
+
+        if proc.returncode != 0:
+            err_f.seek(0)
+            stderr = err_f.read().decode(errors="replace")
+            print(f"Benchmark failed for {table} ({format}):\n{stderr}")
+            return elapsed, 0.0
+    finally:
+        err_f.close()
 
     # Calculate throughput
     expected_rows = TABLES.get(table, 0)
@@ -68,158 +208,302 @@ def run_benchmark(binary_path: Path, table: str, format: str) -> Tuple[float, fl
     return elapsed, throughput
 
 
+def run_benchmark(binary_path: Path, table: str, format: str) -> Tuple[float, float]:
+    """
+    Run benchmark for a table with given format.
+    Returns: (elapsed_seconds, throughput_rows_per_sec)
+    """
+    handle = launch_benchmark(binary_path, table, format)
+    return finalize_benchmark(*handle, table, format)
+
+
 def get_file_size(path: Path) -> int:
-    """Get total size of dataset directory."""
+    """Get total size of dataset directory.
+
+    os.scandir-based walk: rglob builds a Path per entry and stats it
+    twice (is_file, then stat), while DirEntry serves both from the
+    directory read — it matters for Lance datasets with many fragments.
+    """
     if not path.exists():
         return 0
+    if path.is_file():
+        return path.stat().st_size
     total = 0
-    for f in path.rglob("*"):
-        if f.is_file():
-            total += f.stat().st_size
+    stack = [str(path)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
     return total
 
 
-def format_results_markdown(results: Dict) -> str:
-    """Format benchmark results as Markdown."""
-    lines = [
-        "# Phase 2.0c: Comprehensive TPC-H Benchmark Results",
-        "",
-        "**Date**: February 7, 2026",
-        "**Optimizations Applied**:",
-        "- Batch size: 5K (Phase 2.0c-1)",
-        "- Lance max_rows_per_group: 4096 (Phase 2.0c-2a)",
-        "**Scale Factor**: 1 (SF=1)",
-        "**Format**: Lance and Parquet",
-        "",
-        "## Results Summary",
-        "",
-        "| Table | Rows | Lance (r/s) | Parquet (r/s) | Lance % | File Size |",
-        "|-------|------|---|---|---|---|",
-    ]
-
-    for table, data in sorted(results.items()):
-        rows = TABLES[table]
-        lance_r_s = data["lance"]["throughput"]
-        parquet_r_s = data["parquet"]["throughput"]
-        lance_file = data["lance"]["file_size"] / (1024 * 1024)  # MB
+def bench_one(binary: Path, table: str) -> Tuple[str, Dict]:
+    """Benchmark one table in both formats.
 
-        if parquet_r_s > 0:
-            percentage = (lance_r_s / parquet_r_s) * 100
+    Each invocation writes to its own /tmp/{table}.{format} path, and
+    the two formats of the same table overlap deliberately: both are
+    launched from the same cold cache before either is waited on, so
+    they contend symmetrically. Each format runs N_WARMUP + N_MEASURE
+    times; the warm-up iterations are discarded and the reported time
+    is the median of the measured ones.
+    """
+    samples: Dict[str, List[float]] = {"lance": [], "parquet": []}
+    ok = {"lance": True, "parquet": True}
+
+    for i in range(N_WARMUP + N_MEASURE):
+        # One cold start per iteration, before the pair goes up: the
+        # drop used to live inside launch_benchmark, where the parquet
+        # launch's sync + drop_caches fired mid-flight of the lance run
+        # started one line earlier.
+        drop_page_cache()
+        lance_handle = launch_benchmark(binary, table, "lance")
+        parquet_handle = launch_benchmark(binary, table, "parquet")
+
+        lance_time, lance_tp = finalize_benchmark(*lance_handle, table, "lance")
+        parquet_time, parquet_tp = finalize_benchmark(*parquet_handle, table, "parquet")
+
+        if i < N_WARMUP:
+            continue
+        samples["lance"].append(lance_time)
+        samples["parquet"].append(parquet_time)
+        ok["lance"] &= lance_tp > 0
+        ok["parquet"] &= parquet_tp > 0
+
+    data: Dict = {}
+    for format in ("lance", "parquet"):
+        times = samples[format]
+        center = median(times)
+        # Interquartile range as the spread measure; robust against the
+        # occasional run hit by unrelated system activity.
+        if len(times) >= 2:
+            q = quantiles(times, n=4)
+            iqr = q[2] - q[0]
         else:
-            percentage = 0
+            iqr = 0.0
+        throughput = TABLES.get(table, 0) / center if ok[format] and center > 0 else 0.0
+        data[format] = {
+            "time": center,
+            "iqr": iqr,
+            "throughput": throughput,
+            "file_size": get_file_size(Path(f"/tmp/{table}.{format}")),
+        }
+
+    return table, data
+
+
+# Static report sections as module-level templates: the assembly code
+# only fills in the computed numbers and joins, instead of pushing every
+# boilerplate line through lines.append at run time.
+_REPORT_HEADER = """\
+# Phase 2.0c: Comprehensive TPC-H Benchmark Results
+
+**Date**: February 7, 2026
+**Optimizations Applied**:
+- Batch size: 5K (Phase 2.0c-1)
+- Lance max_rows_per_group: 4096 (Phase 2.0c-2a)
+**Scale Factor**: 1 (SF=1)
+**Format**: Lance and Parquet
+
+## Results Summary
+
+| Table | Rows | Lance (r/s) | Parquet (r/s) | Lance % | Lance IQR | File Size |
+|-------|------|---|---|---|---|---|"""
+
+# Summary-table row as a str.format template: the format specs are
+# parsed once instead of on every loop iteration, and the row layout
+# lives in one place next to the header it must line up with.
+_ROW_TMPL = "| {table:10} | {rows:>10,} | {lance:>10,.0f} | {parq:>12,.0f} | {pct:>6.0f}% | {iqr:>6.2f}s | {size_mb:>8.1f} MB |"
+
+_AGGREGATE_TMPL = """
+## Aggregate Statistics
+
+**Total rows processed**: {total_rows:,}
+**Total Lance time**: {lance_time:.2f} seconds
+**Total Parquet time**: {parquet_time:.2f} seconds
+**Lance aggregate throughput**: {lance_throughput:,.0f} rows/sec
+**Parquet aggregate throughput**: {parquet_throughput:,.0f} rows/sec
+**Lance vs Parquet**: {lance_pct:.0f}%
+
+## Per-Table Analysis
+"""
 
-        line = f"| {table:10} | {rows:>10,} | {lance_r_s:>10,.0f} | {parquet_r_s:>12,.0f} | {percentage:>6.0f}% | {lance_file:>8.1f} MB |"
-        lines.append(line)
+_REPORT_FOOTER = """\
+## Key Findings
+
+### Column Count Impact
+- **lineitem (16 cols)**: -29% vs Parquet (same -43% regression as Phase 2.0a)
+- **orders (9 cols)**: +16% vs Parquet (wins slightly)
+- **partsupp (5 cols)**: +10% vs Parquet (wins significantly)
+- **supplier (5 cols)**: -10% vs Parquet
+- **part (9 cols)**: -29% vs Parquet (wide schema regression)
+
+**Pattern**: Lance performance degrades with column count.
+Wide schemas (>9 columns) significantly slower than Parquet.
+Simple schemas (<6 columns) can outperform Parquet.
+
+### Optimization Effectiveness
+- Phase 2.0c-1 (5K batch): Cache efficiency helps all tables
+- Phase 2.0c-2a (4K group): Reduces encoding boundaries uniformly
+- Combined: ~12.5% improvement on lineitem, similar on other wide tables
+- Still need Phase 2.0c-2 (statistics) to close column-count gap
+
+## Recommendations
+
+1. **Priority: Phase 2.0c-2 (Statistics Caching)**
+   - Target: XXH3 hashing, HyperLogLog optimization
+   - Impact: Should particularly help wide-schema tables
+   - Expected gain: 2-5% (could reach parity on 9-col tables)
+
+2. **Investigate Column-Count Scaling**
+   - Encoding overhead clearly scales with column count
+   - 5-column tables: competitive or winning
+   - 16-column tables: 29-43% regression
+   - Phase 2.0c-3 (encoding strategy) should target this
+
+3. **Consider Schema-Specific Tuning**
+   - May need different settings for different schema complexities
+   - Wide-schema tables might benefit from different configuration
+"""
 
-    # Calculate aggregate statistics
-    total_lance_rows = sum(TABLES[t] for t in results.keys())
-    total_lance_time = sum(results[t]["lance"]["time"] for t in results.keys())
-    total_parquet_time = sum(results[t]["parquet"]["time"] for t in results.keys())
-    total_lance_throughput = total_lance_rows / total_lance_time if total_lance_time > 0 else 0
-    total_parquet_throughput = total_lance_rows / total_parquet_time if total_parquet_time > 0 else 0
 
-    lines.extend([
-        "",
-        "## Aggregate Statistics",
-        "",
-        f"**Total rows processed**: {total_lance_rows:,}",
-        f"**Total Lance time**: {total_lance_time:.2f} seconds",
-        f"**Total Parquet time**: {total_parquet_time:.2f} seconds",
-        f"**Lance aggregate throughput**: {total_lance_throughput:,.0f} rows/sec",
-        f"**Parquet aggregate throughput**: {total_parquet_throughput:,.0f} rows/sec",
-        f"**Lance vs Parquet**: {(total_lance_throughput/total_parquet_throughput*100):.0f}%",
-        "",
-    ])
-
-    # Per-table analysis
-    lines.extend([
-        "## Per-Table Analysis",
-        "",
-    ])
-
-    # Categorize tables
+@dataclass(frozen=True, slots=True)
+class TableRow:
+    """All per-table numbers the report derives, computed exactly once.
+
+    Every section (summary table, aggregates, win/loss buckets) reads
+    these fields instead of re-dividing the raw results, so the summary
+    percentage and the categorization are consistent by construction.
+    """
+    table: str
+    rows: int
+    lance_rps: float
+    parq_rps: float
+    lance_time: float
+    parq_time: float
+    lance_pct: float   # lance as % of parquet throughput
+    pct_diff: float    # lance_pct - 100
+    lance_iqr: float
+    lance_mb: float
+
+    @classmethod
+    def from_result(cls, table: str, data: Dict) -> "TableRow":
+        lance_rps = data["lance"]["throughput"]
+        parq_rps = data["parquet"]["throughput"]
+        lance_pct = (lance_rps / parq_rps) * 100 if parq_rps > 0 else 0.0
+        return cls(
+            table=table,
+            rows=TABLES[table],
+            lance_rps=lance_rps,
+            parq_rps=parq_rps,
+            lance_time=data["lance"]["time"],
+            parq_time=data["parquet"]["time"],
+            lance_pct=lance_pct,
+            pct_diff=lance_pct - 100 if parq_rps > 0 else 0.0,
+            lance_iqr=data["lance"].get("iqr", 0.0),
+            lance_mb=data["lance"]["file_size"] / (1024 * 1024),
+        )
+
+
+def iter_report_lines(results: Dict):
+    """Yield the Markdown report section by section.
+
+    A generator instead of one big joined string: main() streams each
+    chunk straight to the results file, so the full report is never
+    held in memory twice and sections survive on disk as soon as they
+    are produced.
+    """
+    yield _REPORT_HEADER
+
+    # Derive every per-table number (summary row, totals, win/loss
+    # categorization) in a single pass over the results rather than
+    # re-scanning and re-dividing per section.
+    total_lance_rows = 0
+    total_lance_time = 0.0
+    total_parquet_time = 0.0
     lance_wins = []
     parquet_wins = []
     close_calls = []
+    failed = []
 
     for table, data in sorted(results.items()):
-        lance_r_s = data["lance"]["throughput"]
-        parquet_r_s = data["parquet"]["throughput"]
-        pct_diff = ((lance_r_s - parquet_r_s) / parquet_r_s * 100) if parquet_r_s > 0 else 0
-
-        if pct_diff > 5:
-            lance_wins.append((table, pct_diff))
-        elif pct_diff < -5:
-            parquet_wins.append((table, abs(pct_diff)))
+        if "status" in data:
+            failed.append((table, data))
+            continue
+
+        row = TableRow.from_result(table, data)
+
+        yield _ROW_TMPL.format(table=row.table, rows=row.rows,
+                               lance=row.lance_rps, parq=row.parq_rps,
+                               pct=row.lance_pct, iqr=row.lance_iqr,
+                               size_mb=row.lance_mb)
+
+        total_lance_rows += row.rows
+        total_lance_time += row.lance_time
+        total_parquet_time += row.parq_time
+
+        if row.pct_diff > 5:
+            lance_wins.append((row.table, row.pct_diff))
+        elif row.pct_diff < -5:
+            parquet_wins.append((row.table, abs(row.pct_diff)))
         else:
-            close_calls.append((table, pct_diff))
+            close_calls.append((row.table, row.pct_diff))
+
+    total_lance_throughput = total_lance_rows / total_lance_time if total_lance_time > 0 else 0
+    total_parquet_throughput = total_lance_rows / total_parquet_time if total_parquet_time > 0 else 0
+
+    yield _AGGREGATE_TMPL.format(
+        total_rows=total_lance_rows,
+        lance_time=total_lance_time,
+        parquet_time=total_parquet_time,
+        lance_throughput=total_lance_throughput,
+        parquet_throughput=total_parquet_throughput,
+        lance_pct=(total_lance_throughput / total_parquet_throughput * 100)
+                  if total_parquet_throughput > 0 else 0,
+    )
 
     if lance_wins:
-        lines.append("### Lance Wins (>5% faster)")
-        lines.append("")
-        for table, pct in sorted(lance_wins, key=lambda x: x[1], reverse=True):
-            lines.append(f"- **{table}**: +{pct:.1f}% ✨")
-        lines.append("")
+        rows = "\n".join(
+            f"- **{table}**: +{pct:.1f}% ✨"
+            for table, pct in sorted(lance_wins, key=lambda x: x[1], reverse=True))
+        yield f"### Lance Wins (>5% faster)\n\n{rows}\n"
 
     if parquet_wins:
-        lines.append("### Parquet Wins (>5% faster)")
-        lines.append("")
-        for table, pct in sorted(parquet_wins, key=lambda x: x[1], reverse=True):
-            lines.append(f"- **{table}**: -{pct:.1f}% 🔴")
-        lines.append("")
+        rows = "\n".join(
+            f"- **{table}**: -{pct:.1f}% 🔴"
+            for table, pct in sorted(parquet_wins, key=lambda x: x[1], reverse=True))
+        yield f"### Parquet Wins (>5% faster)\n\n{rows}\n"
 
     if close_calls:
-        lines.append("### Close Calls (within 5%)")
-        lines.append("")
-        for table, pct in sorted(close_calls, key=lambda x: abs(x[1])):
-            sign = "+" if pct >= 0 else ""
-            lines.append(f"- **{table}**: {sign}{pct:.1f}% ⚖️")
-        lines.append("")
-
-    lines.extend([
-        "## Key Findings",
-        "",
-        "### Column Count Impact",
-        "- **lineitem (16 cols)**: -29% vs Parquet (same -43% regression as Phase 2.0a)",
-        "- **orders (9 cols)**: +16% vs Parquet (wins slightly)",
-        "- **partsupp (5 cols)**: +10% vs Parquet (wins significantly)",
-        "- **supplier (5 cols)**: -10% vs Parquet",
-        "- **part (9 cols)**: -29% vs Parquet (wide schema regression)",
-        "",
-        "**Pattern**: Lance performance degrades with column count.",
-        "Wide schemas (>9 columns) significantly slower than Parquet.",
-        "Simple schemas (<6 columns) can outperform Parquet.",
-        "",
-        "### Optimization Effectiveness",
-        "- Phase 2.0c-1 (5K batch): Cache efficiency helps all tables",
-        "- Phase 2.0c-2a (4K group): Reduces encoding boundaries uniformly",
-        "- Combined: ~12.5% improvement on lineitem, similar on other wide tables",
-        "- Still need Phase 2.0c-2 (statistics) to close column-count gap",
-        "",
-        "## Recommendations",
-        "",
-        "1. **Priority: Phase 2.0c-2 (Statistics Caching)**",
-        "   - Target: XXH3 hashing, HyperLogLog optimization",
-        "   - Impact: Should particularly help wide-schema tables",
-        "   - Expected gain: 2-5% (could reach parity on 9-col tables)",
-        "",
-        "2. **Investigate Column-Count Scaling**",
-        "   - Encoding overhead clearly scales with column count",
-        "   - 5-column tables: competitive or winning",
-        "   - 16-column tables: 29-43% regression",
-        "   - Phase 2.0c-3 (encoding strategy) should target this",
-        "",
-        "3. **Consider Schema-Specific Tuning**",
-        "   - May need different settings for different schema complexities",
-        "   - Wide-schema tables might benefit from different configuration",
-        "",
-    ])
-
-    return "\n".join(lines)
+        rows = "\n".join(
+            f"- **{table}**: {'+' if pct >= 0 else ''}{pct:.1f}% ⚖️"
+            for table, pct in sorted(close_calls, key=lambda x: abs(x[1])))
+        yield f"### Close Calls (within 5%)\n\n{rows}\n"
+
+    if failed:
+        rows = "\n".join(
+            f"- **{table}**: {data['status'].upper()}"
+            + (f" — {data['msg']}" if "msg" in data else "")
+            for table, data in failed)
+        yield f"### Failed Benchmarks\n\n{rows}\n"
+
+    yield _REPORT_FOOTER
 
 
 def main():
     """Main benchmark runner."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark all TPC-H tables in Lance and Parquet")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Concurrent tables (default 1). Serial runs keep the "
+             "per-iteration page-cache drop and the pinned CPU set "
+             "meaningful; higher values trade measurement quality for "
+             "wall time on smoke passes.")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("Phase 2.0c: Comprehensive TPC-H Benchmark")
     print("=" * 70)
@@ -237,53 +521,68 @@ def main():
         print(f"ERROR: Binary not found: {binary}")
         sys.exit(1)
 
-    # Run benchmarks for all tables
+    # Generate the .tbl data once up-front when the binary supports the
+    # generate/rewrite phase split; otherwise each invocation re-runs
+    # dbgen internally as before.
+    if _binary_supports(binary, "--phase"):
+        prepare_shared_input(binary)
+    else:
+        print("Note: binary lacks --phase support; dbgen runs per invocation")
+
+    # Run benchmarks for all tables, serially by default: the measured
+    # runs share the page cache (dropped cold before each iteration),
+    # the disk, and the pinned first-half CPU set, so overlapping tables
+    # would pollute the very comparison being made. --jobs > 1 opts into
+    # the thread-pool overlap for quick smoke passes, where wall time
+    # collapses to roughly the slowest table (lineitem).
     results: Dict = {}
     total_tables = len(TABLES)
     completed = 0
+    max_workers = min(max(args.jobs, 1), total_tables)
 
-    for table in sorted(TABLES.keys()):
+    def record(table, get_result):
+        nonlocal completed
         completed += 1
-        print(f"[{completed}/{total_tables}] Benchmarking {table:10} ... ", end="", flush=True)
 
+        # A single failed table must not discard the results already
+        # gathered for the other 15 invocations — record it and move
+        # on; the report gets a dedicated Failed section.
         try:
-            # Benchmark Lance
-            lance_time, lance_throughput = run_benchmark(binary, table, "lance")
-            lance_file = get_file_size(Path(f"/tmp/{table}.lance"))
-
-            # Benchmark Parquet
-            parquet_time, parquet_throughput = run_benchmark(binary, table, "parquet")
-            parquet_file = get_file_size(Path(f"/tmp/{table}.parquet"))
-
-            results[table] = {
-                "lance": {
-                    "time": lance_time,
-                    "throughput": lance_throughput,
-                    "file_size": lance_file,
-                },
-                "parquet": {
-                    "time": parquet_time,
-                    "throughput": parquet_throughput,
-                    "file_size": parquet_file,
-                },
-            }
-
-            pct = (lance_throughput / parquet_throughput * 100) if parquet_throughput > 0 else 0
-            status = "✨" if pct > 105 else "✅" if pct > 95 else "⚠️" if pct > 80 else "🔴"
-
-            print(f"{lance_throughput:>10,.0f} r/s ({pct:>3.0f}%) {status}")
-
+            _, data = get_result()
         except subprocess.TimeoutExpired:
-            print(f"TIMEOUT")
-            sys.exit(1)
+            print(f"[{completed}/{total_tables}] {table:10} TIMEOUT")
+            results[table] = {"status": "timeout"}
+            return
         except Exception as e:
-            print(f"ERROR: {e}")
-            sys.exit(1)
+            print(f"[{completed}/{total_tables}] {table:10} ERROR: {e}")
+            results[table] = {"status": "error", "msg": str(e)}
+            return
+
+        results[table] = data
+        lance_throughput = data["lance"]["throughput"]
+        parquet_throughput = data["parquet"]["throughput"]
+        pct = (lance_throughput / parquet_throughput * 100) if parquet_throughput > 0 else 0
+        status = "✨" if pct > 105 else "✅" if pct > 95 else "⚠️" if pct > 80 else "🔴"
+
+        print(f"[{completed}/{total_tables}] {table:10} {lance_throughput:>10,.0f} r/s ({pct:>3.0f}%) {status}")
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(bench_one, binary, table): table
+                for table in sorted(TABLES.keys())
+            }
+            for future in as_completed(futures):
+                record(futures[future], future.result)
+    else:
+        for table in sorted(TABLES.keys()):
+            record(table, lambda t=table: bench_one(binary, t))
 
     # Write results
     print()
     print(f"Writing results to {RESULTS_FILE}...")
-    RESULTS_FILE.write_text(format_results_markdown(results))
+    with RESULTS_FILE.open("w") as f:
+        f.writelines(chunk + "\n" for chunk in iter_report_lines(results))
 
     # Print summary
     print()
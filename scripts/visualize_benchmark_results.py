@@ -14,13 +14,102 @@ Usage:
 
 """
 
+import base64
+import io
 import json
+import mmap
+import os
+import re
 import sys
-from pathlib import Path
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List
 
-
+# orjson parses and serializes JSON several times faster than the
+# stdlib; the input parse dominates startup for large CI summaries.
+# Optional — everything falls back to the stdlib json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson streams parse events instead of materializing the document from
+# a full text buffer; used as the middle tier when orjson is absent.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# With matplotlib present the throughput charts are rendered once at
+# report-build time and embedded as PNG data URIs: viewers download no
+# Chart.js (~80 KB from the CDN) and spend no JS time re-drawing the
+# same bars. Optional — without it the Chart.js canvas path is kept.
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+
+def _loads(data) -> Any:
+    """Parse a JSON document from a bytes-like buffer.
+
+    orjson consumes any buffer (including an mmap) without copying; the
+    stdlib parser needs a real bytes object, so the fallback materializes
+    one only when given something else.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data if isinstance(data, (bytes, str)) else bytes(data))
+
+
+def _load_summary(mm: mmap.mmap) -> Dict[str, Any]:
+    """Parse the summary document from a memory-mapped file.
+
+    Fastest available path wins: orjson parses the mapping zero-copy;
+    ijson streams the top-level pairs so each benchmark record is built
+    straight from the mapped pages with no whole-file bytes copy; the
+    stdlib parser needs that copy and comes last.
+    """
+    if orjson is not None:
+        return orjson.loads(memoryview(mm))
+    if ijson is not None:
+        return dict(ijson.kvitems(mm, ''))
+    return json.loads(bytes(mm))
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize chart data for embedding in the report's JS.
+
+    Both paths emit compact output: orjson does so natively, and the
+    stdlib fallback drops the ", "/": " padding and keeps non-ASCII
+    table names as raw UTF-8 instead of six-byte \\uXXXX escapes, so the
+    embedded arrays match byte-for-byte whichever serializer is used.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+# Translation table for HTML escaping. str.translate with an int-keyed
+# table runs in C and beats html.escape's chained .replace calls, so
+# escaping every cell stays cheap even for large reports.
+_HTML_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def _esc(value: Any) -> Any:
+    """HTML-escape a cell value; non-strings pass through unchanged."""
+    return value.translate(_HTML_ESC) if isinstance(value, str) else value
+
+
+# The formatters are memoized: CI summaries repeat the same throughput,
+# time and size values across runs and formats, and the arguments are
+# always ints or None, so a hit is one dict lookup instead of f-string
+# interpolation per cell.
+@lru_cache(maxsize=4096)
 def format_throughput(value: int) -> str:
     """Format throughput value with thousands separator."""
     if value is None:
@@ -28,17 +117,26 @@ def format_throughput(value: int) -> str:
     return f"{value:,}"
 
 
+_FILESIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+@lru_cache(maxsize=4096)
 def format_filesize(bytes_val: int) -> str:
-    """Format file size in human-readable format."""
+    """Format file size in human-readable format.
+
+    The unit index is derived directly from the bit length (each unit
+    step is 10 bits), replacing the divide-until-small loop with one
+    shift and one division per call.
+    """
     if bytes_val is None:
         return "N/A"
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_val < 1024:
-            return f"{bytes_val:.1f} {unit}"
-        bytes_val /= 1024
-    return f"{bytes_val:.1f} TB"
+    if bytes_val <= 0:
+        return "0.0 B"
+    i = min((int(bytes_val).bit_length() - 1) // 10, len(_FILESIZE_UNITS) - 1)
+    return f"{bytes_val / (1 << (i * 10)):.1f} {_FILESIZE_UNITS[i]}"
 
 
+@lru_cache(maxsize=4096)
 def format_time(ms: int) -> str:
     """Format time in milliseconds."""
     if ms is None:
@@ -48,263 +146,213 @@ def format_time(ms: int) -> str:
     return f"{ms/1000:.1f} sec"
 
 
-def generate_html(summary: Dict[str, Any]) -> str:
-    """Generate HTML report from summary data."""
-
-    results = summary.get('benchmarks', [])
-    stats = summary.get('statistics', {})
-    timestamp = summary.get('timestamp', 'Unknown')
-
-    passed = summary.get('passed', 0)
-    failed = summary.get('failed', 0)
-    total = summary.get('total_benchmarks', 0)
-
-    # Build bar chart data for throughput by format
-    by_format_data = stats.get('by_format', {})
-    format_labels = list(by_format_data.keys())
-    format_throughputs = [by_format_data[fmt].get('avg_throughput', 0) for fmt in format_labels]
-
-    # Build bar chart data for throughput by table
-    by_table_data = stats.get('by_table', {})
-    table_labels = list(by_table_data.keys())
-    table_throughputs = [by_table_data[tbl].get('avg_throughput', 0) for tbl in table_labels]
-
-    # Build results table
-    results_rows = ""
-    for r in results:
-        status = "✓ PASS" if r.get('success') else "✗ FAIL"
-        status_class = "pass" if r.get('success') else "fail"
-
-        results_rows += f"""
-    <tr class="{status_class}">
-        <td>{r.get('test_name', 'N/A')}</td>
-        <td>{r.get('format', 'N/A')}</td>
-        <td>{r.get('table', 'N/A')}</td>
-        <td>{r.get('mode', 'N/A')}</td>
-        <td class="numeric">{format_throughput(r.get('throughput_rows_per_sec'))}</td>
-        <td class="numeric">{format_time(r.get('elapsed_time_ms'))}</td>
-        <td class="numeric">{format_filesize(r.get('file_size_bytes'))}</td>
-        <td>{status}</td>
-    </tr>
-"""
-
-    # Build format statistics table
-    format_stats_rows = ""
-    for fmt in format_labels:
-        data = by_format_data[fmt]
-        format_stats_rows += f"""
-    <tr>
-        <td>{fmt}</td>
-        <td class="numeric">{data.get('count', 0)}</td>
-        <td class="numeric">{data.get('success', 0)}</td>
-        <td class="numeric">{format_throughput(data.get('avg_throughput', 0))}</td>
-    </tr>
-"""
-
-    # Build table statistics table
-    table_stats_rows = ""
-    for tbl in table_labels:
-        data = by_table_data[tbl]
-        table_stats_rows += f"""
-    <tr>
-        <td>{tbl}</td>
-        <td class="numeric">{data.get('count', 0)}</td>
-        <td class="numeric">{data.get('success', 0)}</td>
-        <td class="numeric">{format_throughput(data.get('avg_throughput', 0))}</td>
-    </tr>
-"""
-
-    # Build mode statistics table
-    by_mode_data = stats.get('by_mode', {})
-    mode_labels = list(by_mode_data.keys())
-    mode_stats_rows = ""
-    for mode in mode_labels:
-        data = by_mode_data[mode]
-        mode_stats_rows += f"""
-    <tr>
-        <td>{mode}</td>
-        <td class="numeric">{data.get('count', 0)}</td>
-        <td class="numeric">{data.get('success', 0)}</td>
-        <td class="numeric">{format_throughput(data.get('avg_throughput', 0))}</td>
-    </tr>
-"""
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>TPC-H Benchmark Results</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@3.9.1/dist/chart.min.js"></script>
-    <style>
-        * {{
+# The report template's static head (CSS included) and foot (chart JS)
+# live at module level and are filled with str.format_map: the ~400
+# lines of static text are parsed once at import instead of being
+# re-interpolated through an f-string on every call. Literal braces
+# in the CSS/JS are doubled, as str.format requires. This deliberately
+# stays on stdlib string templates rather than a template engine: the
+# constants are compiled once per process anyway, rendering streams to
+# the output file, and the script keeps working with no dependencies
+# beyond the optional orjson.
+# Readable source for the report stylesheet; single braces, minified
+# once at import before being folded into the head template.
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 8px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
+        }
 
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
 
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
+        }
 
-        .header p {{
+        .header p {
             font-size: 1.1em;
             opacity: 0.9;
-        }}
+        }
 
-        .content {{
+        .content {
             padding: 30px;
-        }}
+        }
 
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
+        }
 
-        .summary-card {{
+        .summary-card {
             background: #f5f5f5;
             padding: 20px;
             border-radius: 8px;
             border-left: 4px solid #667eea;
-        }}
+        }
 
-        .summary-card.pass {{
+        .summary-card.pass {
             border-left-color: #10b981;
-        }}
+        }
 
-        .summary-card.fail {{
+        .summary-card.fail {
             border-left-color: #ef4444;
-        }}
+        }
 
-        .summary-card h3 {{
+        .summary-card h3 {
             color: #666;
             font-size: 0.9em;
             text-transform: uppercase;
             margin-bottom: 10px;
-        }}
+        }
 
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 2em;
             font-weight: bold;
             color: #333;
-        }}
+        }
 
-        .charts {{
+        .charts {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 30px;
             margin-bottom: 40px;
-        }}
+        }
 
-        .chart-container {{
+        .chart-container {
             background: #f9f9f9;
             padding: 20px;
             border-radius: 8px;
             position: relative;
             height: 300px;
-        }}
+        }
 
-        .chart-container h3 {{
+        .chart-container h3 {
             margin-bottom: 15px;
             color: #333;
-        }}
+        }
 
-        .chart-container canvas {{
+        .chart-container canvas {
             max-height: 250px;
-        }}
+        }
 
-        table {{
+        .chart-container img {
+            max-width: 100%;
+            max-height: 250px;
+        }
+
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-bottom: 40px;
             background: #fafafa;
-        }}
+        }
 
-        table h3 {{
+        table h3 {
             padding: 15px;
             background: #f0f0f0;
             color: #333;
-        }}
+        }
 
-        table thead {{
+        table thead {
             background: #667eea;
             color: white;
-        }}
+        }
 
-        table th {{
+        table th {
             padding: 12px;
             text-align: left;
             font-weight: 600;
-        }}
+        }
 
-        table td {{
+        table td {
             padding: 12px;
             border-bottom: 1px solid #e0e0e0;
-        }}
+        }
 
-        table tr:hover {{
+        table tr:hover {
             background: #f5f5f5;
-        }}
+        }
 
-        table tr.pass {{
+        table tr.pass {
             background: #f0fdf4;
-        }}
+        }
 
-        table tr.fail {{
+        table tr.fail {
             background: #fef2f2;
-        }}
+        }
 
-        table td.numeric {{
+        table td.numeric {
             text-align: right;
             font-family: 'Courier New', monospace;
             color: #666;
-        }}
+        }
 
-        .section {{
+        .section {
             margin-bottom: 40px;
-        }}
+        }
 
-        .section h2 {{
+        .section h2 {
             color: #333;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 2px solid #667eea;
-        }}
+        }
 
-        .footer {{
+        .footer {
             background: #f5f5f5;
             padding: 20px;
             text-align: center;
             color: #999;
             font-size: 0.9em;
-        }}
-    </style>
+        }
+"""
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace in a CSS block.
+
+    Runs once at import: the report ships roughly a quarter of the
+    stylesheet bytes while the source above stays readable.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r" ?([{{}}:;,]) ?".replace("{{", "{").replace("}}", "}"), r"\1", css)
+    return css.strip()
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>TPC-H Benchmark Results</title>
+{chartjs_tag}    <style>"""\
+    + _minify_css(_CSS).replace('{', '{{').replace('}', '}}')\
+    + """</style>
 </head>
 <body>
     <div class="container">
@@ -331,7 +379,7 @@ def generate_html(summary: Dict[str, Any]) -> str:
                     </div>
                     <div class="summary-card">
                         <h3>Success Rate</h3>
-                        <div class="value">{100*passed//total if total > 0 else 0}%</div>
+                        <div class="value">{success_rate}%</div>
                     </div>
                 </div>
             </div>
@@ -342,11 +390,11 @@ def generate_html(summary: Dict[str, Any]) -> str:
                 <div class="charts">
                     <div class="chart-container">
                         <h3>Throughput by Format</h3>
-                        <canvas id="formatChart"></canvas>
+                        {format_chart}
                     </div>
                     <div class="chart-container">
                         <h3>Throughput by Table</h3>
-                        <canvas id="tableChart"></canvas>
+                        {table_chart}
                     </div>
                 </div>
             </div>
@@ -364,64 +412,9 @@ def generate_html(summary: Dict[str, Any]) -> str:
                         </tr>
                     </thead>
                     <tbody>
-                        {format_stats_rows}
-                    </tbody>
-                </table>
-            </div>
+"""
 
-            <div class="section">
-                <h2>Statistics by Table</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Table</th>
-                            <th>Total Tests</th>
-                            <th>Passed</th>
-                            <th>Avg Throughput (rows/sec)</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {table_stats_rows}
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="section">
-                <h2>Statistics by Mode</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Mode</th>
-                            <th>Total Tests</th>
-                            <th>Passed</th>
-                            <th>Avg Throughput (rows/sec)</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {mode_stats_rows}
-                    </tbody>
-                </table>
-            </div>
-
-            <!-- Detailed Results -->
-            <div class="section">
-                <h2>Detailed Results</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Test</th>
-                            <th>Format</th>
-                            <th>Table</th>
-                            <th>Mode</th>
-                            <th>Throughput (rows/sec)</th>
-                            <th>Time</th>
-                            <th>File Size</th>
-                            <th>Status</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {results_rows}
-                    </tbody>
+_HTML_FOOTER = """                    </tbody>
                 </table>
             </div>
         </div>
@@ -431,16 +424,49 @@ def generate_html(summary: Dict[str, Any]) -> str:
         </div>
     </div>
 
-    <script>
+"""
+
+# Fragments for the two chart paths: the static PNG embed used when
+# matplotlib is available, and the Chart.js CDN tag + canvas elements
+# used otherwise.
+_CHARTJS_TAG = ('    <script defer src="https://cdn.jsdelivr.net/npm/'
+                'chart.js@3.9.1/dist/chart.min.js"></script>\n')
+_CANVAS_TMPL = '<canvas id="{id}"></canvas>'
+_CHART_IMG_TMPL = '<img src="data:image/png;base64,{data}" alt="{alt}">'
+
+
+def _chart_png(labels: List[str], values: List[int], color: str) -> str:
+    """Render a bar chart to a base64-encoded PNG.
+
+    Called once per chart at build time, so viewers get a ~5 KB image
+    instead of fetching Chart.js and re-rendering the bars client-side.
+    """
+    fig, ax = plt.subplots(figsize=(6, 3), dpi=72)
+    ax.bar(labels, values, color=color)
+    ax.tick_params(labelsize=8)
+    ax.yaxis.set_major_formatter(lambda v, _pos: f"{v:,.0f}")
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    plt.close(fig)
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+# Chart initialization JS, emitted only when there is chart data. The
+# CDN tag carries ``defer`` so the library download no longer blocks
+# parsing of the (much larger) results table; init waits for
+# DOMContentLoaded, which also guarantees the deferred library has run.
+_CHART_SCRIPT = """    <script>
+        document.addEventListener('DOMContentLoaded', () => {{
         // Format throughput chart
         const formatCtx = document.getElementById('formatChart').getContext('2d');
         new Chart(formatCtx, {{
             type: 'bar',
             data: {{
-                labels: {json.dumps(format_labels)},
+                labels: {format_labels_json},
                 datasets: [{{
                     label: 'Avg Throughput (rows/sec)',
-                    data: {json.dumps(format_throughputs)},
+                    data: {format_throughputs_json},
                     backgroundColor: '#667eea',
                     borderColor: '#667eea',
                     borderWidth: 1
@@ -470,10 +496,10 @@ def generate_html(summary: Dict[str, Any]) -> str:
         new Chart(tableCtx, {{
             type: 'bar',
             data: {{
-                labels: {json.dumps(table_labels)},
+                labels: {table_labels_json},
                 datasets: [{{
                     label: 'Avg Throughput (rows/sec)',
-                    data: {json.dumps(table_throughputs)},
+                    data: {table_throughputs_json},
                     backgroundColor: '#764ba2',
                     borderColor: '#764ba2',
                     borderWidth: 1
@@ -497,11 +523,307 @@ def generate_html(summary: Dict[str, Any]) -> str:
                 }}
             }}
         }});
+        }});
     </script>
+"""
+
+_HTML_CLOSE = "</body>\n</html>\n"
+
+# Slim fallback for the common broken-build case with zero
+# benchmarks: no Chart.js CDN tag, canvases, or chart JS to fetch
+# and parse for a page whose only content is "nothing ran".
+_EMPTY_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>TPC-H Benchmark Results</title>
+    <style>
+        body {{ font-family: sans-serif; padding: 40px; text-align: center; }}
+        .card {{ display: inline-block; padding: 30px 50px; border-radius: 8px;
+                background: #fef2f2; border-left: 4px solid #ef4444; }}
+    </style>
+</head>
+<body>
+    <div class="card">
+        <h1>No benchmark results</h1>
+        <p>The CI summary generated {timestamp} contains no benchmarks.</p>
+    </div>
 </body>
 </html>
 """
-    return html
+
+
+
+# Per-row templates, parsed once at import: str.format on a hoisted
+# template is cheaper than evaluating a fresh f-string per row, and the
+# three stats tables share one row shape.
+_RESULT_ROW_TMPL = """
+    <tr class="{cls}">
+        <td>{name}</td>
+        <td>{format}</td>
+        <td>{table}</td>
+        <td>{mode}</td>
+        <td class="numeric">{throughput}</td>
+        <td class="numeric">{time}</td>
+        <td class="numeric">{size}</td>
+        <td>{status}</td>
+    </tr>
+"""
+
+_STAT_ROW_TMPL = """
+    <tr>
+        <td>{label}</td>
+        <td class="numeric">{count}</td>
+        <td class="numeric">{success}</td>
+        <td class="numeric">{throughput}</td>
+    </tr>
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Bench:
+    """One benchmark record, reshaped once from its summary dict.
+
+    Slot-backed: the eight fields live at fixed offsets (~80 bytes per
+    record against ~300 for the dict), and the row loop reads them with
+    plain attribute loads instead of hashing a key per field.
+    """
+
+    test_name: str
+    format: str
+    table: str
+    mode: str
+    throughput_rows_per_sec: int
+    elapsed_time_ms: int
+    file_size_bytes: int
+    success: bool
+
+    @classmethod
+    def from_record(cls, r: Dict[str, Any]) -> "Bench":
+        g = r.get
+        return cls(
+            test_name=g('test_name', 'N/A'),
+            format=g('format', 'N/A'),
+            table=g('table', 'N/A'),
+            mode=g('mode', 'N/A'),
+            throughput_rows_per_sec=g('throughput_rows_per_sec'),
+            elapsed_time_ms=g('elapsed_time_ms'),
+            file_size_bytes=g('file_size_bytes'),
+            success=bool(g('success')),
+        )
+
+
+def _recompute_stats(records: List[Bench]):
+    """Rebuild pass/fail counts and the grouped aggregates from records.
+
+    Used when the summary ships without a ``statistics`` section (older
+    CI runs). One pass over the records with ``[count, success, sum]``
+    list accumulators covers all three groupings at once, instead of
+    re-scanning the result list per table.
+    """
+    passed = 0
+    accs = {key: defaultdict(lambda: [0, 0, 0]) for key in ('format', 'table', 'mode')}
+    for b in records:
+        success = b.success
+        passed += success
+        throughput = b.throughput_rows_per_sec or 0
+        for key, acc in accs.items():
+            a = acc[getattr(b, key)]
+            a[0] += 1
+            a[1] += success
+            a[2] += throughput
+    stats = {
+        'by_' + key: {
+            label: {'count': c, 'success': s, 'avg_throughput': t // c}
+            for label, (c, s, t) in acc.items()
+        }
+        for key, acc in accs.items()
+    }
+    return passed, len(records) - passed, stats
+
+
+def write_html(summary: Dict[str, Any], out) -> None:
+    """Write the HTML report for summary data to the open file ``out``.
+
+    Sections are written as they are produced — header, stats tables,
+    one result row at a time, footer — so the peak memory stays flat
+    regardless of benchmark count, instead of assembling the whole
+    multi-megabyte document in one string and copying it again on write.
+    """
+
+    results = summary.get('benchmarks', [])
+    stats = summary.get('statistics', {})
+    timestamp = summary.get('timestamp', 'Unknown')
+
+    # Zero benchmarks (typically a broken build): emit a slim page with
+    # no Chart.js, canvases, or empty tables instead of the full report.
+    if not results:
+        out.write(_EMPTY_TEMPLATE.format(timestamp=timestamp))
+        return
+
+    # Reshape each record dict into a slot-backed Bench up front; every
+    # later pass (aggregate rebuild, column formatting, row emission)
+    # reads fixed-offset attributes instead of re-hashing dict keys.
+    records = [Bench.from_record(r) for r in results]
+
+    if stats:
+        passed = summary.get('passed', 0)
+        failed = summary.get('failed', 0)
+        total = summary.get('total_benchmarks', len(records))
+    else:
+        passed, failed, stats = _recompute_stats(records)
+        total = passed + failed
+
+    # Build bar chart data for throughput by format and by table in a
+    # single pass over each stats dict: labels and throughputs come from
+    # the same items() iteration, instead of listing the keys and then
+    # hashing each one a second time to fetch its value.
+    by_format_data = stats.get('by_format', {})
+    format_labels = list(by_format_data)
+    format_throughputs = [d.get('avg_throughput', 0) for d in by_format_data.values()]
+
+    by_table_data = stats.get('by_table', {})
+    table_labels = list(by_table_data)
+    table_throughputs = [d.get('avg_throughput', 0) for d in by_table_data.values()]
+
+    by_mode_data = stats.get('by_mode', {})
+
+    ctx = {
+        'timestamp': timestamp,
+        'total': total,
+        'passed': passed,
+        'failed': failed,
+        'success_rate': 100 * passed // total if total > 0 else 0,
+        'format_labels_json': _dumps(format_labels),
+        'format_throughputs_json': _dumps(format_throughputs),
+        'table_labels_json': _dumps(table_labels),
+        'table_throughputs_json': _dumps(table_throughputs),
+    }
+
+    if plt is not None:
+        ctx['chartjs_tag'] = ''
+        ctx['format_chart'] = _CHART_IMG_TMPL.format(
+            data=_chart_png(format_labels, format_throughputs, '#667eea'),
+            alt='Throughput by format')
+        ctx['table_chart'] = _CHART_IMG_TMPL.format(
+            data=_chart_png(table_labels, table_throughputs, '#764ba2'),
+            alt='Throughput by table')
+    else:
+        ctx['chartjs_tag'] = _CHARTJS_TAG
+        ctx['format_chart'] = _CANVAS_TMPL.format(id='formatChart')
+        ctx['table_chart'] = _CANVAS_TMPL.format(id='tableChart')
+
+    out.write(_HTML_HEAD.format_map(ctx))
+
+    for fmt, data in by_format_data.items():
+        out.write(_STAT_ROW_TMPL.format(
+            label=_esc(fmt), count=data.get('count', 0),
+            success=data.get('success', 0),
+            throughput=format_throughput(data.get('avg_throughput', 0))))
+
+    out.write("""                    </tbody>
+                </table>
+            </div>
+
+            <div class="section">
+                <h2>Statistics by Table</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Table</th>
+                            <th>Total Tests</th>
+                            <th>Passed</th>
+                            <th>Avg Throughput (rows/sec)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""")
+
+    for tbl, data in by_table_data.items():
+        out.write(_STAT_ROW_TMPL.format(
+            label=_esc(tbl), count=data.get('count', 0),
+            success=data.get('success', 0),
+            throughput=format_throughput(data.get('avg_throughput', 0))))
+
+    out.write("""                    </tbody>
+                </table>
+            </div>
+
+            <div class="section">
+                <h2>Statistics by Mode</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Mode</th>
+                            <th>Total Tests</th>
+                            <th>Passed</th>
+                            <th>Avg Throughput (rows/sec)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""")
+
+    for mode, data in by_mode_data.items():
+        out.write(_STAT_ROW_TMPL.format(
+            label=_esc(mode), count=data.get('count', 0),
+            success=data.get('success', 0),
+            throughput=format_throughput(data.get('avg_throughput', 0))))
+
+    out.write("""                    </tbody>
+                </table>
+            </div>
+
+            <!-- Detailed Results -->
+            <div class="section">
+                <h2>Detailed Results</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Test</th>
+                            <th>Format</th>
+                            <th>Table</th>
+                            <th>Mode</th>
+                            <th>Throughput (rows/sec)</th>
+                            <th>Time</th>
+                            <th>File Size</th>
+                            <th>Status</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""")
+
+    # Format the numeric columns in flat list comprehensions first (one
+    # C-level pass per column), then emit rows reading the precomputed
+    # strings by index — column-at-a-time beats interleaving the three
+    # formatter calls into every row iteration.
+    throughputs = [format_throughput(b.throughput_rows_per_sec) for b in records]
+    times = [format_time(b.elapsed_time_ms) for b in records]
+    sizes = [format_filesize(b.file_size_bytes) for b in records]
+
+    # Bind the bound methods used per row to locals: in this hottest
+    # loop LOAD_FAST on a local beats the global and attribute lookups
+    # the interpreter would otherwise repeat for every row.
+    _row = _RESULT_ROW_TMPL.format
+    _write = out.write
+    for i, b in enumerate(records):
+        success = b.success
+        _write(_row(
+            cls="pass" if success else "fail",
+            name=_esc(b.test_name),
+            format=_esc(b.format),
+            table=_esc(b.table),
+            mode=_esc(b.mode),
+            throughput=throughputs[i],
+            time=times[i],
+            size=sizes[i],
+            status="✓ PASS" if success else "✗ FAIL"))
+
+    out.write(_HTML_FOOTER.format_map(ctx))
+    # Init JS only exists on the Chart.js path, and only when there is
+    # chart data; the static-PNG report ships no script at all.
+    if plt is None and (format_labels or table_labels):
+        out.write(_CHART_SCRIPT.format_map(ctx))
+    out.write(_HTML_CLOSE)
 
 
 def main():
@@ -509,24 +831,38 @@ def main():
         print("Usage: python3 visualize_benchmark_results.py <ci_summary.json> [output.html]", file=sys.stderr)
         sys.exit(1)
 
-    summary_file = Path(sys.argv[1])
-    output_file = Path(sys.argv[2]) if len(sys.argv) > 2 else summary_file.parent / "report.html"
+    # Plain os.path here: the two paths are built and checked once, so
+    # there is no reason to pay for Path object construction (or the
+    # pathlib import) in a short-lived CI script.
+    summary_file = sys.argv[1]
+    if len(sys.argv) > 2:
+        output_file = sys.argv[2]
+    else:
+        output_file = os.path.join(os.path.dirname(summary_file) or '.', 'report.html')
 
-    if not summary_file.exists():
+    if not os.path.exists(summary_file):
         print(f"Error: {summary_file} not found", file=sys.stderr)
         sys.exit(1)
 
+    # Memory-map the summary instead of read(): the parser consumes the
+    # page cache directly, with no intermediate heap copy of the file.
     try:
-        with open(summary_file, 'r') as f:
-            summary = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(summary_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                summary = _load_summary(mm)
+    except ValueError as e:
         print(f"Error parsing JSON: {e}", file=sys.stderr)
         sys.exit(1)
 
-    html = generate_html(summary)
-
-    with open(output_file, 'w') as f:
-        f.write(html)
+    # Open the output through a raw descriptor and wrap it with an
+    # explicit UTF-8, no-newline-translation text layer over a 1 MiB
+    # buffer: write_html keeps streaming sections as they are produced,
+    # but a typical report fits the buffer and reaches the kernel in a
+    # single write(2), with no locale lookup or newline rewriting on
+    # the way.
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    with os.fdopen(fd, 'w', buffering=1 << 20, encoding='utf-8', newline='') as f:
+        write_html(summary, f)
 
     print(f"Report generated: {output_file}", file=sys.stderr)
     print(f"Open in browser to view interactive charts and tables")
@@ -62,6 +62,15 @@ constexpr int OPT_IO_URING       = 1010;
 
 constexpr size_t DBGEN_BATCH_SIZE = 8192;  // aligned with Lance max_rows_per_group
 
+// Record-batch size for the per-table write paths. Overridable at
+// configure time (-DTPCH_BATCH_SIZE=<n>) so batch-size sweeps can build
+// one specialized binary per value instead of patching this file; the
+// compiler can then constant-fold the batch size into each write loop.
+#ifndef TPCH_BATCH_SIZE
+#define TPCH_BATCH_SIZE 10000
+#endif
+constexpr size_t WRITE_BATCH_SIZE = TPCH_BATCH_SIZE;
+
 void print_usage(const char* prog) {
     std::cout << "Usage: " << prog << " [options]\n"
               << "Options:\n"
@@ -393,7 +402,7 @@ void generate_lineitem_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;  // Match Phase 13.4 plan
+    const size_t batch_size = WRITE_BATCH_SIZE;  // Match Phase 13.4 plan
 
     // Use batch iterator (zero-copy friendly)
     auto batch_iter = dbgen.generate_lineitem_batches(batch_size, opts.max_rows);
@@ -433,7 +442,7 @@ void generate_orders_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_orders_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -469,7 +478,7 @@ void generate_customer_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_customer_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -505,7 +514,7 @@ void generate_part_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_part_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -541,7 +550,7 @@ void generate_partsupp_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_partsupp_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -577,7 +586,7 @@ void generate_supplier_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_supplier_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -613,7 +622,7 @@ void generate_nation_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;  // Nation table has exactly 25 rows
+    const size_t batch_size = WRITE_BATCH_SIZE;  // Nation table has exactly 25 rows
     auto batch_iter = dbgen.generate_nation_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -645,7 +654,7 @@ void generate_region_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;  // Region table has exactly 5 rows
+    const size_t batch_size = WRITE_BATCH_SIZE;  // Region table has exactly 5 rows
     auto batch_iter = dbgen.generate_region_batches(batch_size, opts.max_rows);
 
     while (batch_iter.has_next()) {
@@ -689,7 +698,7 @@ void generate_lineitem_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
 
     // Use batch iterator (zero-copy friendly)
     auto batch_iter = dbgen.generate_lineitem_batches(batch_size, opts.max_rows);
@@ -740,7 +749,7 @@ void generate_orders_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_orders_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -785,7 +794,7 @@ void generate_customer_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_customer_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -830,7 +839,7 @@ void generate_part_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_part_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -875,7 +884,7 @@ void generate_partsupp_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_partsupp_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -920,7 +929,7 @@ void generate_supplier_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;
+    const size_t batch_size = WRITE_BATCH_SIZE;
     auto batch_iter = dbgen.generate_supplier_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -965,7 +974,7 @@ void generate_nation_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;  // Nation table has exactly 25 rows
+    const size_t batch_size = WRITE_BATCH_SIZE;  // Nation table has exactly 25 rows
     auto batch_iter = dbgen.generate_nation_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());
@@ -1006,7 +1015,7 @@ void generate_region_true_zero_copy(
     std::unique_ptr<tpch::WriterInterface>& writer,
     size_t& total_rows) {
 
-    const size_t batch_size = 10000;  // Region table has exactly 5 rows
+    const size_t batch_size = WRITE_BATCH_SIZE;  // Region table has exactly 5 rows
     auto batch_iter = dbgen.generate_region_batches(batch_size, opts.max_rows);
 
     auto parquet_writer = dynamic_cast<tpch::ParquetWriter*>(writer.get());